@@ -4,7 +4,7 @@ from mono_tools.qt import QtCore, QtWidgets
 import hou
 from .file_manager_manager import MonoFileManager
 from .file_manager_minibar import MonoFileMiniBar
-from .file_manager_helpers import SUBPATH, collect_files
+from .file_manager_helpers import SUBPATH
 
 _active_dialog=None
 _active_minibar=None
@@ -36,7 +36,7 @@ def show_mono_minibar():
     d=_make_manager()
     base=os.path.join(d.root_le.text().strip(), SUBPATH) if d.root_le.text().strip() else ""
     if base and os.path.isdir(base):
-        mb.populate(collect_files(base, depth=1))
+        mb.populate_from_dir(base, depth=1)
     return mb
 
 class FileManagerWrapper:
@@ -1,5 +1,7 @@
-import os, re, platform, subprocess, shutil, json
+import os, re, platform, subprocess, json
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from mono_tools.qt import QtCore, QtGui, QtWidgets
 import hou
 
@@ -7,7 +9,6 @@ ORG="Mono"; APP="FileManager"
 SUBPATH=os.path.join("02_shots","03_lighting")
 HOUDINI_EXTS={".hip",".hiplc",".hipnc"}
 VER_RX=re.compile(r"(?:^|[_\.])v(\d{1,4})(?:[_\.]|$)", re.IGNORECASE)
-SHOT_RX=re.compile(r'^(Sh\d+|SH\d+)', re.IGNORECASE)
 
 def human_size(b):
     try: b=float(b)
@@ -66,51 +67,71 @@ def is_current_file(file_path):
     if not current or not file_path: return False
     return os.path.normpath(file_path) == current
 
+# ---------- Filename parsing ----------
+TASK_DIRS={"03_lighting", "02_animation", "01_modeling", "04_comp", "05_render"}
+# One compiled pattern pulls every token out of the filename stem in a single match() call:
+#   shot     first Sh010 / SH_010 / shot-010 ...
+#   ver      first v012 bounded by start/_/. (same rule as VER_RX)
+#   num      first bare 3-4 digit run outside a version token (last-resort shot number)
+HIP_NAME_RX=re.compile(
+    r"(?=(?:.*?(?P<shot>(?:sh|shot)[-_]?(?P<shot_num>\d+)))?)"
+    r"(?=(?:.*?(?<![^_.])v(?P<ver>\d{1,4})(?![^_.]))?)"
+    r"(?=(?:.*?(?<![v\d])(?P<num>\d{3,4}))?)", re.IGNORECASE)
+HEAD_RX=re.compile(r"[^_-]*")
+TASK_PREFIX_RX=re.compile(r"^\d+_")
+
+class HipInfo:
+    """Parsed hip filename. Instances are shared by the parse cache - treat them as read-only."""
+    __slots__=("shot", "task", "ver", "ver_num", "note")
+    def __init__(self, shot, task, ver, ver_num, note):
+        self.shot=shot; self.task=task; self.ver=ver; self.ver_num=ver_num; self.note=note
+    def __repr__(self):
+        return f"HipInfo(shot={self.shot!r}, task={self.task!r}, ver={self.ver!r}, note={self.note!r})"
+
+@lru_cache(maxsize=4096)
+def _dir_info(folder):
+    """(task, shot folder) for a directory - shared by every file in it"""
+    task=""; shot=None
+    if not folder: return task, shot
+    parts=os.path.normpath(folder).split(os.sep)
+    for i, part in enumerate(parts):
+        if part in TASK_DIRS:
+            if not task: task=TASK_PREFIX_RX.sub("", part)
+            if len(parts) > i + 1 and '.' not in parts[i + 1]:
+                shot=parts[i + 1]; break
+    return task, shot
+
+@lru_cache(maxsize=131072)
+def parse_hip_path(path):
+    """Single-pass parse of shot / task / version / note from a hip path (or bare filename)"""
+    cut=max(path.rfind(os.sep), path.rfind('/'))
+    folder=path[:cut] if cut>=0 else ""; name=path[cut+1:]
+    dot=name.rfind('.'); stem=name[:dot] if dot>0 and name[dot:].lower() in HOUDINI_EXTS else name
+    m=HIP_NAME_RX.match(stem)
+    task, dir_shot=_dir_info(folder)
+    shot_tok=m.group("shot"); num=m.group("num")
+    if shot_tok and m.start("shot")==0 and shot_tok[2].isdigit():
+        shot="Sh"+m.group("shot_num")  # Sh010 at the start of the name is kept as-is
+    elif dir_shot:
+        shot=dir_shot
+    elif shot_tok:
+        shot=f"Sh{m.group('shot_num').zfill(3)}"
+    elif num:
+        shot=f"Sh{num.zfill(3)}"
+    else:
+        head=HEAD_RX.match(stem).group()
+        shot=head[:10] if len(head) > 2 else "Unknown"
+    if m.group("ver"):
+        ver_num=int(m.group("ver")); ver=f"v{ver_num:03d}"; note=stem[m.end("ver"):].strip("_.-")
+    else:
+        ver_num=0; ver=""; note=""
+    return HipInfo(shot, task, ver, ver_num, note)
+
 def infer_shot(full_path):
-    filename = os.path.basename(full_path)
-    match = SHOT_RX.match(filename)
-    if match:
-        shot_name = match.group(1)
-        shot_upper = shot_name.upper()
-        if shot_upper.startswith('SH'):
-            return 'Sh' + shot_upper[2:]
-        return shot_name
-    parts=os.path.normpath(full_path).split(os.sep)
-    try:
-        # Look for common shot patterns in path
-        for i, part in enumerate(parts):
-            if part in ["03_lighting", "02_animation", "01_modeling", "04_comp", "05_render"]:
-                if len(parts) > i + 1:
-                    folder_name = parts[i + 1]
-                    if '.' not in folder_name:
-                        return folder_name
-    except ValueError: pass
-    
-    # Fallback: try to extract from filename
-    filename = os.path.basename(full_path)
-    name, ext = os.path.splitext(filename)
-    
-    # Look for shot patterns in filename (Sh001, SH002, shot_001, etc.)
-    shot_match = re.search(r'(?:sh|shot)[-_]?(\d+)', name, re.IGNORECASE)
-    if shot_match:
-        return f"Sh{shot_match.group(1).zfill(3)}"
-    
-    # Look for any 3-digit number that might be a shot
-    number_match = re.search(r'(\d{3,4})', name)
-    if number_match:
-        return f"Sh{number_match.group(1).zfill(3)}"
-    
-    # Last resort: use first part of filename (before any version info)
-    clean_name = re.sub(r'[_-]v\d+.*$', '', name)  # Remove version info
-    clean_name = re.sub(r'[_-].*$', '', clean_name)  # Remove everything after first separator
-    if clean_name and len(clean_name) > 2:
-        return clean_name[:10]  # Limit length
-    
-    return "Unknown"
+    return parse_hip_path(full_path).shot
 
 def parse_ver(name):
-    m=VER_RX.search(name)
-    return f"v{int(m.group(1)):03d}" if m else ""
+    return parse_hip_path(name).ver
 
 def increment_version_and_backup(current_filepath, note=""):
     try:
@@ -143,29 +164,73 @@ def increment_version_and_backup(current_filepath, note=""):
             name_only = os.path.splitext(filename)[0]
             backup_filename = f"{name_only}_{timestamp}{ext}"
             backup_path = os.path.join(vers_folder, backup_filename)
-        hou.hipFile.save()
-        shutil.copy2(current_filepath, backup_path)
-        hou.hipFile.setName(new_filepath)
-        hou.hipFile.save()
+        # Save once, straight to the new name; the old file on disk becomes the archived version
+        hou.hipFile.save(new_filepath)
         try:
-            if os.path.exists(current_filepath): os.remove(current_filepath)
-        except Exception: pass
-        message = f"✅ Saved as {os.path.basename(new_filepath)}\n📦 Old version moved to Vers/"
+            os.replace(current_filepath, backup_path)  # same filesystem: instant rename, no second write
+            archived = "📦 Old version moved to Vers/"
+        except OSError:
+            from .file_manager_worker import archive_in_background  # worker imports the index, which imports this module
+            archive_in_background(current_filepath, backup_path)
+            archived = "📦 Old version is being copied to Vers/ in the background"
+        message = f"✅ Saved as {os.path.basename(new_filepath)}\n{archived}"
         if note and note.strip(): message += f"\n📝 Note: {note}"
         return True, new_filepath, message
     except Exception as e:
         error_msg = f"Lỗi khi save version: {str(e)}"
         return False, "", error_msg
 
+# ---------- Directory scanning ----------
+SCAN_WORKERS=8
+SKIP_DIRS={"Vers","backups"}
+
+def _list_dir(path):
+    """List one directory -> (houdini files, subdirectories). Backup folders are skipped."""
+    files=[]; dirs=[]
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                try:
+                    if e.is_dir():
+                        if not e.name.startswith('.') and e.name not in SKIP_DIRS: dirs.append(e.path)
+                    elif os.path.splitext(e.name)[1].lower() in HOUDINI_EXTS:
+                        files.append(e.path)
+                except OSError: pass
+    except OSError as e:
+        print(f"⚠️ scandir error: {e}")
+    return files, dirs
+
+def walk_dirs(base_dir, depth=1, visit=_list_dir, workers=SCAN_WORKERS):
+    """Walk base_dir up to `depth` levels, listing directories on a bounded thread pool.
+
+    `visit(path)` runs on a worker thread and returns (payload, subdirs); payloads are
+    yielded as soon as each directory finishes, so callers can stream results.
+    """
+    if not os.path.isdir(base_dir): return
+    depth=max(1, int(depth))
+    if depth==1:
+        yield visit(base_dir)[0]; return
+    pool=ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="MonoScan")
+    try:
+        pending={pool.submit(visit, base_dir): 1}
+        while pending:
+            done,_=wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                level=pending.pop(fut)
+                payload, subdirs=fut.result()
+                if level<depth:
+                    for d in subdirs: pending[pool.submit(visit, d)]=level+1
+                yield payload
+    finally:
+        # Consumer may stop early (cancel) - drop queued listings instead of waiting for them
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def iter_files(base_dir, depth=1):
+    for files in walk_dirs(base_dir, depth):
+        yield from files
+
 def collect_files(base_dir, depth=1):
-    if not os.path.isdir(base_dir): return []
-    results=[]
-    if depth<=1:
-        for e in os.scandir(base_dir):
-            if e.is_file() and os.path.splitext(e.name)[1].lower() in HOUDINI_EXTS:
-                results.append(e.path)
-        return results
-    return results
+    return list(iter_files(base_dir, depth))
 
 # ---------- Project root & tabs helpers ----------
 DEFAULT_ROOT = r"D:\\Dropbox\\Job"
@@ -0,0 +1,120 @@
+# Persistent scan index for Mono File Manager (Houdini 21 / Python 3.11)
+# - One JSON file under the Houdini user pref dir, keyed by directory
+# - Each directory stores its mtime + subdirs + per-file (name, size, mtime, shot, ver)
+# - A rescan only re-lists directories whose mtime changed: one stat per directory otherwise
+import os, json, threading
+from collections import namedtuple
+import hou
+from .file_manager_helpers import HOUDINI_EXTS, SKIP_DIRS, walk_dirs, infer_shot, parse_ver
+
+INDEX_VERSION=2
+INDEX_FILE="mono_file_index.json"
+
+FileEntry=namedtuple("FileEntry", "path name size mtime shot ver")
+
+def default_index_path():
+    try: base=hou.getenv("HOUDINI_USER_PREF_DIR") or hou.homeHoudiniDirectory()
+    except Exception: base=None
+    return os.path.join(base or os.path.expanduser("~"), INDEX_FILE)
+
+class ScanIndex:
+    def __init__(self, path=None):
+        self.path=path or default_index_path()
+        self._dirs={}  # dirpath -> {"mtime": float, "subdirs": [name], "files": [[name, size, mtime, shot, ver]]}
+        self._lock=threading.Lock(); self._dirty=False
+        self._save_lock=threading.Lock()  # saves run on scan worker threads: one writer at a time
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f: data=json.load(f)
+            if data.get("version")==INDEX_VERSION and isinstance(data.get("dirs"), dict):
+                self._dirs=data["dirs"]
+        except FileNotFoundError: pass
+        except Exception as e:
+            print(f"⚠️ Scan index unreadable, starting fresh: {e}")
+
+    def save(self):
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty: return
+                payload=json.dumps({"version": INDEX_VERSION, "dirs": self._dirs}, separators=(",", ":"))
+                self._dirty=False
+            # Unique per process + thread: another ScanIndex on the same file may save concurrently
+            tmp=f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f: f.write(payload)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"⚠️ Could not save scan index: {e}")
+                try: os.remove(tmp)
+                except OSError: pass
+
+    def invalidate(self, dir_path=None):
+        with self._lock:
+            if dir_path is None: self._dirs.clear()
+            else: self._dirs.pop(os.path.normpath(dir_path), None)
+            self._dirty=True
+
+    def _visit(self, path, force=False):
+        """Runs on a scan worker thread. Returns ([FileEntry], [subdir paths])."""
+        path=os.path.normpath(path)
+        try: dir_mtime=os.stat(path).st_mtime
+        except OSError:
+            with self._lock:
+                if self._dirs.pop(path, None) is not None: self._dirty=True
+            return [], []
+        with self._lock: cached=self._dirs.get(path)
+        if cached and not force and cached.get("mtime")==dir_mtime:
+            files=cached["files"]; subdirs=cached["subdirs"]
+        else:
+            files=[]; subdirs=[]
+            try:
+                with os.scandir(path) as it:
+                    for e in it:
+                        try:
+                            if e.is_dir():
+                                if not e.name.startswith('.') and e.name not in SKIP_DIRS: subdirs.append(e.name)
+                            elif os.path.splitext(e.name)[1].lower() in HOUDINI_EXTS:
+                                st=e.stat()
+                                files.append([e.name, st.st_size, st.st_mtime, infer_shot(e.path), parse_ver(e.name)])
+                        except OSError: pass
+            except OSError as e:
+                print(f"⚠️ scandir error: {e}"); return [], []
+            with self._lock:
+                self._dirs[path]={"mtime": dir_mtime, "subdirs": subdirs, "files": files}; self._dirty=True
+        entries=[FileEntry(os.path.join(path, f[0]), *f) for f in files]
+        return entries, [os.path.join(path, d) for d in subdirs]
+
+    def iter_scan(self, base_dir, depth=1, force=False):
+        """Yield lists of FileEntry, one per directory, as the parallel walk finds them."""
+        try:
+            yield from walk_dirs(base_dir, depth, visit=lambda p: self._visit(p, force))
+        finally:
+            self.save()
+
+    def known_dirs(self, base_dir, depth=1):
+        """Directories a scan of base_dir/depth visits, from the index only (no IO)"""
+        result=[]; level=[os.path.normpath(base_dir)]
+        with self._lock:
+            for _ in range(max(1, int(depth))):
+                nxt=[]
+                for d in level:
+                    entry=self._dirs.get(d)
+                    if entry is None: continue
+                    result.append(d); nxt.extend(os.path.join(d, n) for n in entry["subdirs"])
+                level=nxt
+        return result
+
+    def scan(self, base_dir, depth=1, force=False):
+        entries=[]
+        for batch in self.iter_scan(base_dir, depth, force): entries.extend(batch)
+        return entries
+
+_shared_index=None
+
+def get_scan_index():
+    global _shared_index
+    if _shared_index is None: _shared_index=ScanIndex()
+    return _shared_index
@@ -1,8 +1,9 @@
 import os
 from mono_tools.qt import QtCore, QtGui, QtWidgets
 import hou
-from .file_manager_helpers import ORG, APP, SUBPATH, collect_files, parse_ver, infer_shot, list_projects, DEFAULT_ROOT, load_tabs_settings, save_tabs_settings
+from .file_manager_helpers import ORG, APP, SUBPATH, list_projects, DEFAULT_ROOT, load_tabs_settings, save_tabs_settings
 from .file_manager_models import FileTableModel
+from .file_manager_worker import ScanController
 from .file_manager_helpers import open_in_explorer
 
 class MonoFileManager(QtWidgets.QDialog):
@@ -17,6 +18,9 @@ class MonoFileManager(QtWidgets.QDialog):
         self.depth_sb = None
         self.tabs_conf = []
         self._minibar_ref=None
+        self._scanner=ScanController(self)
+        self._scanner.rows.connect(self._on_scan_rows); self._scanner.done.connect(self._on_scan_done); self._scanner.error.connect(self._on_scan_error)
+        self._scan_tab=None; self._scan_entries=[]; self._scan_target=None
         self._build_ui(); self._restore(); QtCore.QTimer.singleShot(0,self._center)
 
     def _build_ui(self):
@@ -51,7 +55,7 @@ class MonoFileManager(QtWidgets.QDialog):
         exts_lbl=QtWidgets.QLabel(".hip, .hiplc, .hipnc (fixed)")
         b_add_tab=QtWidgets.QPushButton("+ Tab"); b_add_tab.clicked.connect(self._add_tab)
         b_scan=QtWidgets.QPushButton("Scan"); b_scan.clicked.connect(self.scan)
-        b_refresh=QtWidgets.QPushButton("Refresh"); b_refresh.clicked.connect(self.scan)
+        b_refresh=QtWidgets.QPushButton("Refresh"); b_refresh.setToolTip("Re-list every folder, ignoring the scan index"); b_refresh.clicked.connect(lambda: self.scan(force=True))
         b_open=QtWidgets.QPushButton("Open in Explorer"); b_open.clicked.connect(self._open_selected)
         b_copy=QtWidgets.QPushButton("Copy Path"); b_copy.clicked.connect(self._copy_selected)
         row=QtWidgets.QHBoxLayout(); row.addWidget(b_scan); row.addWidget(b_refresh); row.addStretch(1); row.addWidget(b_open); row.addWidget(b_copy)
@@ -95,27 +99,62 @@ class MonoFileManager(QtWidgets.QDialog):
             return os.path.join(root, subpath)
         else:
             return ""
-    def scan(self):
-        model = self._active_model()
+    def scan(self, force=False):
+        """Start a background scan of the active tab; any scan still running is cancelled"""
+        w = self.current_tabs.currentWidget() if getattr(self, 'current_tabs', None) else None
+        model = getattr(w, 'model', None)
         if not model: return
-        model.removeRows(0,model.rowCount())
+        self._cancel_scan()
+        model.clear()
         base=self._target_dir()
         if not base or not os.path.isdir(base):
             hou.ui.displayMessage(f"Không tìm thấy thư mục:\n{base or '<empty>'}", severity=hou.severityType.Warning); return
-        for f in collect_files(base, depth=self.depth_sb.value()):
-            try:
-                st=os.stat(f)
-                name=os.path.basename(f); ext=os.path.splitext(name)[1].lower()
-                ver=parse_ver(name); shot=infer_shot(f); folder=os.path.dirname(f)
-                model.add_row(shot,ver,name,ext,folder,st.st_mtime,st.st_size,f)
-            except Exception: pass
-        proxy=self._active_proxy(); proxy.sort(FileTableModel.COL_MOD, QtCore.Qt.DescendingOrder)
-        if self.table:
-            for c in (FileTableModel.COL_SHOT,FileTableModel.COL_VER,FileTableModel.COL_EXT,FileTableModel.COL_SIZE): 
-                self.table.resizeColumnToContents(c)
+        depth=self.depth_sb.value()
+        self._scan_tab=w; self._scan_entries=[]; self._scan_target=(base, depth)
+        w.table.setSortingEnabled(False)
+        self._set_tab_status(w, "⏳ Scanning…")
+        self._scanner.start(base, depth, force)
+
+    def _cancel_scan(self):
+        if self._scanner.is_running() and self._scan_tab is not None:
+            self._scanner.cancel()
+            self._scan_tab.table.setSortingEnabled(True)
+            self._set_tab_status(self._scan_tab, "⚠️ Scan cancelled • press Scan to reload")
+        self._scan_tab=None
+
+    def _set_tab_status(self, w, text):
+        lbl=getattr(w, 'status', None)
+        if lbl is None: return
+        lbl.setText(text or ""); lbl.setVisible(bool(text))
+
+    def _on_scan_rows(self, entries):
+        w=self._scan_tab
+        if w is None: return
+        w.model.add_rows((e.shot,e.ver,e.name,os.path.splitext(e.name)[1].lower(),os.path.dirname(e.path),e.mtime,e.size,e.path) for e in entries)
+        self._scan_entries.extend(entries)
+        self._set_tab_status(w, f"⏳ Scanning… {len(self._scan_entries)} files")
+
+    def _on_scan_done(self, count):
+        w=self._scan_tab; self._scan_tab=None
+        if w is None: return
+        self._set_tab_status(w, "" if count else "No files found")
+        w.table.setSortingEnabled(True)
+        w.proxy.sort(FileTableModel.COL_MOD, QtCore.Qt.DescendingOrder)
+        for c in (FileTableModel.COL_SHOT,FileTableModel.COL_VER,FileTableModel.COL_EXT,FileTableModel.COL_SIZE):
+            w.table.resizeColumnToContents(c)
         self._save()
         if hasattr(self, "_minibar_ref") and self._minibar_ref:
-            self._minibar_ref.populate_from_model(model)
+            self._minibar_ref.populate_entries(self._scan_entries, self._scan_target)
+
+    def _on_scan_error(self, message):
+        w=self._scan_tab; self._scan_tab=None
+        if w is None: return
+        w.table.setSortingEnabled(True)
+        self._set_tab_status(w, f"❌ Scan failed: {message}")
+
+    def closeEvent(self, ev):
+        self._cancel_scan()
+        super().closeEvent(ev)
 
     # ---- Projects ----
     def _reload_projects(self):
@@ -209,15 +248,17 @@ class MonoFileManager(QtWidgets.QDialog):
         w=QtWidgets.QWidget(); lay=QtWidgets.QVBoxLayout(w); lay.setContentsMargins(0,0,0,0)
         
         # Create table for this tab
-        model=FileTableModel(self); proxy=QtCore.QSortFilterProxyModel(self); proxy.setSourceModel(model); proxy.setSortCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        model=FileTableModel(self); proxy=QtCore.QSortFilterProxyModel(self); proxy.setSourceModel(model); proxy.setSortCaseSensitivity(QtCore.Qt.CaseInsensitive); proxy.setSortRole(FileTableModel.SORT_ROLE)
         table=QtWidgets.QTableView(); table.setModel(proxy); table.setSortingEnabled(True)
         table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows); table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
         table.doubleClicked.connect(self._dbl_open); table.verticalHeader().setVisible(False); table.horizontalHeader().setStretchLastSection(True)
         table.setAlternatingRowColors(True)
         
+        status=QtWidgets.QLabel(); status.setVisible(False); status.setStyleSheet("color:#9aa7c7; padding:2px 4px;")
+        
         # Store references
-        w.model=model; w.proxy=proxy; w.table=table; w.subpath=subpath; w.depth=depth
-        lay.addWidget(table)
+        w.model=model; w.proxy=proxy; w.table=table; w.status=status; w.subpath=subpath; w.depth=depth
+        lay.addWidget(status); lay.addWidget(table)
         
         # Connect tab change events
         parent_tabs.currentChanged.connect(self._on_tab_changed)
@@ -290,21 +331,16 @@ class MonoFileManager(QtWidgets.QDialog):
         if not ok2 or not new_sub.strip(): return
         self.current_tabs.setTabText(idx, new_name.strip()); w.subpath=new_sub.strip()
     def _selected_fullpath(self):
+        if not self.table: return None
         idxs = self.table.selectionModel().selectedRows()
         if not idxs: return None
-        src = self.proxy.mapToSource(idxs[0])
-        item = self.model.item(src.row(), FileTableModel.COL_SHOT)
-        if not item: return None
-        return item.data(QtCore.Qt.UserRole+1)
+        return idxs[0].data(FileTableModel.PATH_ROLE)
     def _dbl_open(self, proxy_index):
         if not proxy_index.isValid(): return
-        src_index = self.proxy.mapToSource(proxy_index)
-        item = self.model.item(src_index.row(), FileTableModel.COL_SHOT)
-        if item:
-            fp = item.data(QtCore.Qt.UserRole+1)
-            if fp:
-                folder_path = os.path.dirname(fp)
-                open_in_explorer(folder_path)
+        fp = proxy_index.data(FileTableModel.PATH_ROLE)
+        if fp:
+            folder_path = os.path.dirname(fp)
+            open_in_explorer(folder_path)
 
     def _open_selected(self):
         """Open the selected file's folder in Explorer"""
@@ -2,7 +2,11 @@ import os
 import subprocess
 from mono_tools.qt import QtCore, QtGui, QtWidgets
 import hou
-from .file_manager_helpers import ORG, APP, collect_files, get_current_houdini_file, is_current_file, infer_shot, parse_ver, open_in_explorer, get_render_folder_path, increment_version_and_backup
+from .file_manager_worker import ScanController
+from .file_manager_index import get_scan_index
+from .file_manager_watcher import SceneEventWatcher, DirectoryWatcher
+from .file_manager_models import ShotVersionIndex
+from .file_manager_helpers import ORG, APP, get_current_houdini_file, is_current_file, infer_shot, parse_ver, open_in_explorer, get_render_folder_path, increment_version_and_backup
 
 class MainWindowEventFilter(QtCore.QObject):
     def __init__(self, minibar):
@@ -44,7 +48,13 @@ class MonoFileMiniBar(QtWidgets.QWidget):
         self._drag_pos=None; self._is_dragging=False
         self._locked=self.s.value("minibar_locked", False, type=bool)
         self._last_current_file = None; self._position_stable_count = 0; self._last_stable_pos = None
-        self._file_check_timer = QtCore.QTimer(self); self._file_check_timer.timeout.connect(self._check_file_changes); self._file_check_timer.start(2000)
+        self._scan_target = None; self._scan_entries = []; self._pending_entries = []
+        self._versions = ShotVersionIndex(); self._combo_rows = {}
+        self._file_menu = None; self._file_menu_gen = -1
+        self._scanner = ScanController(self); self._scanner.rows.connect(self._pending_entries.extend)
+        self._scanner.done.connect(self._on_scan_done); self._scanner.error.connect(lambda msg: print(f"⚠️ Minibar scan failed: {msg}"))
+        self._scene_watcher = SceneEventWatcher(self); self._scene_watcher.scene_changed.connect(self._check_file_changes)
+        self._dir_watcher = DirectoryWatcher(self); self._dir_watcher.changed.connect(self._revalidate_files); self._rescan_pending = False
         self._setup_main_window_monitoring()
         self.handle_area = QtWidgets.QLabel("⋮⋮"); self.handle_area.setFixedWidth(20); self.handle_area.setAlignment(QtCore.Qt.AlignCenter); self.handle_area.setToolTip("Drag to move • Right-click for options"); self.handle_area.setCursor(QtCore.Qt.OpenHandCursor)
         self.shot_display = QtWidgets.QLineEdit(); self.shot_display.setReadOnly(True); self.shot_display.setMinimumWidth(160); self.shot_display.setMaximumWidth(160); self.shot_display.setToolTip("Click để chọn shot • Chọn shot sẽ mở file trong Houdini"); self.shot_display.setCursor(QtCore.Qt.PointingHandCursor)
@@ -115,12 +125,9 @@ class MonoFileMiniBar(QtWidgets.QWidget):
             self.shot_display.setToolTip("Click để chọn shot • Chọn shot sẽ mở file trong Houdini")
 
     def _auto_select_current_file(self, current_file):
-        for i in range(self.combo.count()):
-            fp = self.combo.itemData(i, role=QtCore.Qt.UserRole)
-            if is_current_file(fp):
-                if self.combo.currentIndex() != i:
-                    self.combo.blockSignals(True); self.combo.setCurrentIndex(i); self.combo.blockSignals(False); self._update_shot_display(i)
-                break
+        i = self._combo_rows.get(os.path.normpath(current_file), -1)
+        if i >= 0 and self.combo.currentIndex() != i:
+            self.combo.blockSignals(True); self.combo.setCurrentIndex(i); self.combo.blockSignals(False); self._update_shot_display(i)
 
     def _update_shot_display(self, idx):
         if idx >= 0 and idx < self.combo.count():
@@ -239,37 +246,76 @@ class MonoFileMiniBar(QtWidgets.QWidget):
 
     # ---- File menu (dropdown) ----
     def _show_file_menu(self):
+        self._revalidate_files()
         if self.combo.count() == 0:
             hou.ui.displayMessage("No files found.\n\nPlease click ⚡ button to open File Manager and scan for files.", severity=hou.severityType.Warning); return
-        menu = QtWidgets.QMenu(); menu.setAttribute(QtCore.Qt.WA_DeleteOnClose); menu.setStyleSheet("""
+        if self._file_menu is None or self._file_menu_gen != self._versions.generation: self._build_file_menu()
+        self._mark_current_in_menu(get_current_houdini_file())
+        self._menu_filter.clear()
+        pos = self.shot_display.mapToGlobal(self.shot_display.rect().bottomLeft())
+        selected_action = self._file_menu.exec_(pos)
+        if selected_action and selected_action.data():
+            idx = self._combo_rows.get(os.path.normpath(selected_action.data()), -1)
+            if idx >= 0: self.combo.setCurrentIndex(idx); self._activate_current(idx)
+
+    def _build_file_menu(self):
+        """Built once per index generation and reused between opens; version submenus fill on hover"""
+        if self._file_menu is not None: self._file_menu.deleteLater()
+        menu = QtWidgets.QMenu(self); menu.setStyleSheet("""
             QMenu { background:#1f1f1f; color:#e5e5e5; border:1px solid #3a3a3a; }
             QMenu::item { padding:8px 16px; }
             QMenu::item:selected { background:#3d5a99; }
+            QLineEdit { background:#2a2a2a; color:#e5e5e5; border:1px solid #3a3a3a; border-radius:4px; padding:4px 6px; margin:4px; }
         """)
-        shot_files = {}
-        for i in range(self.combo.count()):
-            fp = self.combo.itemData(i, role=QtCore.Qt.UserRole)
-            if not fp: continue
-            model_shot = self.combo.itemData(i, role=QtCore.Qt.UserRole+2)
-            shot = model_shot if model_shot else (infer_shot(fp) or "Unknown")
-            filename = os.path.basename(fp); ver_str = parse_ver(filename)
-            try: ver_num = int(ver_str.replace('v', '')) if ver_str else 0
-            except: ver_num = 0
-            if shot not in shot_files or ver_num > shot_files[shot]['version']:
-                shot_files[shot] = {'index': i, 'version': ver_num, 'ver_str': ver_str}
+        self._menu_filter = QtWidgets.QLineEdit(); self._menu_filter.setPlaceholderText("🔍 Type to filter shots…"); self._menu_filter.setClearButtonEnabled(True)
+        self._menu_filter.textChanged.connect(self._filter_file_menu)
+        filter_action = QtWidgets.QWidgetAction(menu); filter_action.setDefaultWidget(self._menu_filter); menu.addAction(filter_action)
+        menu.aboutToShow.connect(lambda: QtCore.QTimer.singleShot(0, self._menu_filter.setFocus))
+        menu.addSeparator()
+        idx_db = self._versions; older = []
+        self._menu_items = []; self._menu_by_path = {}; self._menu_current = None
+        for shot in idx_db.shots():
+            fp = idx_db.latest(shot); ver_str = idx_db.ver_of(fp)
+            text = f"{shot} ({ver_str})" if ver_str else shot
+            action = menu.addAction(text); action.setData(fp)
+            self._menu_items.append((f"{shot} {os.path.basename(fp)}".lower(), action))
+            self._menu_by_path[os.path.normpath(fp)] = (action, text)
+            if idx_db.version_count(shot) > 1: older.append(shot)
+        self._menu_older = None
+        if older:
+            # Older versions: submenu contents are only built when the user hovers into them
+            menu.addSeparator(); self._menu_older = menu.addMenu(f"🕘 Older versions ({len(older)} shots)")
+            self._menu_older.aboutToShow.connect(lambda m=self._menu_older, shots=older: self._fill_older_menu(m, shots))
+        self._file_menu = menu; self._file_menu_gen = idx_db.generation
+
+    def _mark_current_in_menu(self, current_file):
+        """Move the 🎯 marker without rebuilding the cached menu"""
+        hit = self._menu_by_path.get(current_file) if current_file else None
+        if self._menu_current is hit: return
+        for entry, marked in ((self._menu_current, False), (hit, True)):
+            if not entry: continue
+            action, text = entry; font = action.font(); font.setBold(marked); action.setFont(font)
+            action.setText(f"🎯 {text} (Current)" if marked else text)
+        self._menu_current = hit
+
+    def _filter_file_menu(self, text):
+        needle = text.strip().lower()
+        for key, action in self._menu_items: action.setVisible(not needle or needle in key)
+        if self._menu_older is not None: self._menu_older.menuAction().setVisible(not needle)
+
+    def _fill_older_menu(self, menu, shots):
+        if menu.actions(): return
+        for shot in shots:
+            sub = menu.addMenu(f"{shot} ({self._versions.version_count(shot)})")
+            sub.aboutToShow.connect(lambda m=sub, s=shot: self._fill_shot_versions(m, s))
+
+    def _fill_shot_versions(self, menu, shot):
+        if menu.actions(): return
         current_file = get_current_houdini_file()
-        for shot in sorted(shot_files.keys()):
-            file_info = shot_files[shot]; idx = file_info['index']
-            fp = self.combo.itemData(idx, role=QtCore.Qt.UserRole); is_cur = is_current_file(fp) if current_file else False
-            display_text = f"{shot} ({file_info['ver_str']})" if file_info['ver_str'] else shot
-            if is_cur: display_text = f"🎯 {display_text} (Current)"
-            action = menu.addAction(display_text); action.setData(idx)
-            if is_cur:
-                font = action.font(); font.setBold(True); action.setFont(font)
-        pos = self.shot_display.mapToGlobal(self.shot_display.rect().bottomLeft())
-        selected_action = menu.exec_(pos)
-        if selected_action:
-            idx = selected_action.data(); self.combo.setCurrentIndex(idx); self._activate_current(idx)
+        for fp in self._versions.versions(shot)[1:]:
+            text = f"{self._versions.ver_of(fp) or '—'}  {os.path.basename(fp)}"
+            if current_file == os.path.normpath(fp): text = f"🎯 {text}"
+            menu.addAction(text).setData(fp)
 
     def _activate_current(self, idx):
         fp=self.combo.itemData(idx, role=QtCore.Qt.UserRole)
@@ -415,19 +461,19 @@ class MonoFileMiniBar(QtWidgets.QWidget):
 
     # ---- Populate helpers ----
     def populate(self, paths, shot_names=None):
-        self.combo.clear(); shot_names = shot_names or {}
-        for p in sorted(paths):
-            name=os.path.basename(p); ver=parse_ver(name); label=f"{name} ({ver or '—'})"
-            idx=self.combo.count(); self.combo.addItem(label)
+        """Fill the dropdown grouped by shot, newest version first (see ShotVersionIndex)"""
+        self._versions.rebuild(paths, shot_names); self._combo_rows = {}
+        self.combo.blockSignals(True); self.combo.clear()
+        for p in self._versions.ordered_paths():
+            name=os.path.basename(p); ver=self._versions.ver_of(p); label=f"{name} ({ver or '—'})"
+            idx=self.combo.count(); self.combo.addItem(label); self._combo_rows[os.path.normpath(p)]=idx
             self.combo.setItemData(idx, p, QtCore.Qt.UserRole)
-            self.combo.setItemData(idx, label, QtCore.Qt.DisplayRole)
             self.combo.setItemData(idx, name, QtCore.Qt.ToolTipRole)
-            if p in shot_names: self.combo.setItemData(idx, shot_names[p], QtCore.Qt.UserRole+2)
+            self.combo.setItemData(idx, self._versions.shot_of(p), QtCore.Qt.UserRole+2)
+        self.combo.blockSignals(False)
         current_file = get_current_houdini_file(); current_selected=False
-        if current_file:
-            for i in range(self.combo.count()):
-                fp = self.combo.itemData(i, role=QtCore.Qt.UserRole)
-                if is_current_file(fp): self.combo.setCurrentIndex(i); current_selected=True; break
+        if current_file and current_file in self._combo_rows:
+            self.combo.setCurrentIndex(self._combo_rows[current_file]); current_selected=True
         if not current_selected:
             last = self.s.value("last_selected_path", "", type=str)
             if last:
@@ -435,12 +481,53 @@ class MonoFileMiniBar(QtWidgets.QWidget):
                 if i >= 0: self.combo.setCurrentIndex(i)
         self._update_shot_display(self.combo.currentIndex()); self._last_current_file = current_file
 
+    def populate_from_dir(self, base_dir, depth=1, force=False):
+        """Scan base_dir in the background (through the scan index) and fill the dropdown when done"""
+        self._scan_target = (base_dir, depth)
+        self._pending_entries.clear()
+        self._scanner.start(base_dir, depth, force)
+        if self.combo.count() == 0:
+            self.shot_display.setText("Scanning…"); self.shot_display.setToolTip("Scanning files…")
+
+    def populate_entries(self, entries, target=None):
+        """Fill the dropdown from scan-index entries (FileEntry) collected elsewhere, e.g. by the manager"""
+        self._scanner.cancel()
+        self._scan_target = target or self._scan_target
+        self._scan_entries = list(entries)
+        self.populate([e.path for e in self._scan_entries], {e.path: e.shot for e in self._scan_entries})
+        self._update_dir_watch()
+
+    def _on_scan_done(self, count):
+        entries = list(self._pending_entries); self._pending_entries.clear()
+        if entries != self._scan_entries or self.combo.count() != len(entries):
+            self._scan_entries = entries
+            self.populate([e.path for e in entries], {e.path: e.shot for e in entries})
+        self._update_dir_watch()
+        if self._rescan_pending:
+            self._rescan_pending = False; self._revalidate_files()
+
+    def _update_dir_watch(self):
+        if not self._scan_target: self._dir_watcher.clear(); return
+        base_dir, depth = self._scan_target
+        self._dir_watcher.watch(get_scan_index().known_dirs(base_dir, depth))
+
+    def _revalidate_files(self):
+        """Incremental refresh (folder watcher / dropdown open): one stat per folder via the index, off the UI thread"""
+        if not self._scan_target: return
+        if self._scanner.is_running(): self._rescan_pending = True; return
+        base_dir, depth = self._scan_target
+        self._pending_entries.clear()
+        self._scanner.start(base_dir, depth)
+
+    def closeEvent(self, ev):
+        self._scene_watcher.stop(); self._dir_watcher.clear(); self._scanner.cancel()
+        super().closeEvent(ev)
+
     def populate_from_model(self, model):
         paths=[]; shot_names={}
         for r in range(model.rowCount()):
-            p=model.item(r, 0).data(QtCore.Qt.UserRole+1)
-            shot_name = model.item(r, 0).text()
-            if p: paths.append(p); shot_names[p]=shot_name
+            p=model.path(r)
+            if p: paths.append(p); shot_names[p]=model.shot(r)
         self.populate(paths, shot_names)
 
     def _setup_main_window_monitoring(self):
@@ -465,6 +552,7 @@ class MonoFileMiniBar(QtWidgets.QWidget):
                 name = conf.get('name', 'lighting')
                 subpath = conf.get('subpath', '02_shots/03_lighting')
                 self.subpath_cb.addItem(name, subpath)
+                self.subpath_cb.setItemData(self.subpath_cb.count()-1, int(conf.get('depth', 1)), QtCore.Qt.UserRole+1)
             
             # Set default selection
             current_subpath = self.s.value("minibar_subpath", "lighting", type=str)
@@ -478,12 +566,13 @@ class MonoFileMiniBar(QtWidgets.QWidget):
         """Handle subpath dropdown change"""
         if idx >= 0:
             subpath = self.subpath_cb.itemData(idx)
+            depth = self.subpath_cb.itemData(idx, QtCore.Qt.UserRole+1) or 1
             self.s.setValue("minibar_subpath", self.subpath_cb.currentText())
             self.s.sync()
             # Refresh files for new subpath
-            self._refresh_files_for_subpath(subpath)
+            self._refresh_files_for_subpath(subpath, depth)
 
-    def _refresh_files_for_subpath(self, subpath):
+    def _refresh_files_for_subpath(self, subpath, depth=1):
         """Refresh files for specific subpath"""
         try:
             if not self.manager:
@@ -501,9 +590,8 @@ class MonoFileMiniBar(QtWidgets.QWidget):
             if not os.path.isdir(target_dir):
                 return
                 
-            # Collect files and populate
-            files = collect_files(target_dir, depth=1)
-            self.populate(files)
+            # Collect files (through the scan index) and populate
+            self.populate_from_dir(target_dir, depth)
             
         except Exception as e:
             print(f"⚠️ Error refreshing files for subpath: {e}")
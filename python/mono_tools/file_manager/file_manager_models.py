@@ -1,19 +1,103 @@
+from array import array
+from bisect import insort
 from datetime import datetime
-from mono_tools.qt import QtCore, QtGui
-from .file_manager_helpers import human_size
+from mono_tools.qt import QtCore
+from .file_manager_helpers import human_size, parse_hip_path
 
-class FileTableModel(QtGui.QStandardItemModel):
+class FileTableModel(QtCore.QAbstractTableModel):
+    """Column-array backed table: raw values are stored once, display strings are formatted lazily in data()"""
     COL_SHOT=0; COL_VER=1; COL_NAME=2; COL_EXT=3; COL_FOLDER=4; COL_MOD=5; COL_SIZE=6
     HEAD=["Shot","Ver","File Name","Ext","Folder","Modified","Size"]
+    PATH_ROLE=QtCore.Qt.UserRole+1
+    SORT_ROLE=QtCore.Qt.UserRole+2  # raw value (mtime/size as numbers) for QSortFilterProxyModel
     def __init__(self,parent=None):
-        super().__init__(0,len(self.HEAD),parent)
-        self.setHorizontalHeaderLabels(self.HEAD)
+        super().__init__(parent)
+        self._reset_columns()
+    def _reset_columns(self):
+        self._shot=[]; self._ver=[]; self._name=[]; self._ext=[]; self._folder=[]
+        self._mtime=array('d'); self._size=array('q'); self._path=[]
+        self._cols=(self._shot,self._ver,self._name,self._ext,self._folder,self._mtime,self._size)
+
+    # ---- Qt model API ----
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._path)
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEAD)
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role==QtCore.Qt.DisplayRole and orientation==QtCore.Qt.Horizontal and 0<=section<len(self.HEAD):
+            return self.HEAD[section]
+        return None
+    def flags(self, index):
+        return QtCore.Qt.ItemIsEnabled|QtCore.Qt.ItemIsSelectable if index.isValid() else QtCore.Qt.NoItemFlags
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid(): return None
+        r=index.row(); c=index.column()
+        if role==QtCore.Qt.DisplayRole:
+            if c==self.COL_MOD: return datetime.fromtimestamp(self._mtime[r]).strftime("%Y-%m-%d %H:%M")
+            if c==self.COL_SIZE: return human_size(self._size[r])
+            return self._cols[c][r]
+        if role==self.SORT_ROLE: return self._cols[c][r]
+        if role==self.PATH_ROLE: return self._path[r]
+        if role==QtCore.Qt.ToolTipRole and c==self.COL_NAME: return self._path[r]
+        return None
+    def removeRows(self, row, count, parent=QtCore.QModelIndex()):
+        if parent.isValid() or count<=0 or row<0 or row+count>len(self._path): return False
+        if row==0 and count==len(self._path): self.clear(); return True
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row+count-1)
+        for col in self._cols+(self._path,): del col[row:row+count]
+        self.endRemoveRows(); return True
+
+    # ---- Bulk fill ----
+    def add_rows(self, rows):
+        """Append rows of (shot, ver, name, ext, folder, mtime, size, fullpath) with a single insert signal"""
+        rows=list(rows)
+        if not rows: return
+        first=len(self._path)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first+len(rows)-1)
+        shot,ver,name,ext,folder,mtime,sz,fullpath=zip(*rows)
+        self._shot.extend(shot); self._ver.extend(ver); self._name.extend(name); self._ext.extend(ext)
+        self._folder.extend(folder); self._mtime.extend(float(m) for m in mtime); self._size.extend(int(b) for b in sz)
+        self._path.extend(fullpath)
+        self.endInsertRows()
     def add_row(self, shot, ver, name, ext, folder, mtime, sz, fullpath):
-        vals=[shot,ver,name,ext,folder,datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M"),human_size(sz)]
-        items=[]
-        for v in vals:
-            it=QtGui.QStandardItem(str(v)); it.setEditable(False); items.append(it)
-        items[0].setData(fullpath, QtCore.Qt.UserRole+1)
-        self.appendRow(items)
+        self.add_rows([(shot,ver,name,ext,folder,mtime,sz,fullpath)])
+    def clear(self):
+        self.beginResetModel(); self._reset_columns(); self.endResetModel()
+
+    # ---- Row accessors ----
+    def path(self, row): return self._path[row]
+    def shot(self, row): return self._shot[row]
+
 
+class ShotVersionIndex:
+    """shot -> [(ver_num, path)] kept in version order, so the latest file of a shot is a dict lookup"""
+    def __init__(self, paths=(), shot_names=None):
+        self._shots={}; self._by_path={}
+        self.generation=0  # bumped on every change; consumers cache views against it
+        if paths: self.rebuild(paths, shot_names)
+    def rebuild(self, paths, shot_names=None):
+        self._shots.clear(); self._by_path.clear(); shot_names=shot_names or {}
+        for p in paths: self._insert(p, shot_names.get(p))
+        self.generation+=1
+    def _insert(self, path, shot):
+        if path in self._by_path: return
+        info=parse_hip_path(path); shot=shot or info.shot or "Unknown"
+        insort(self._shots.setdefault(shot, []), (info.ver_num, path))
+        self._by_path[path]=(shot, info.ver)
 
+    # ---- Lookups ----
+    def __len__(self): return len(self._by_path)
+    def __contains__(self, path): return path in self._by_path
+    def shots(self): return sorted(self._shots)
+    def latest(self, shot):
+        versions=self._shots.get(shot)
+        return versions[-1][1] if versions else None
+    def versions(self, shot):
+        """Paths of a shot, newest first"""
+        return [p for _, p in reversed(self._shots.get(shot, ()))]
+    def version_count(self, shot): return len(self._shots.get(shot, ()))
+    def shot_of(self, path): return self._by_path.get(path, (None, ""))[0]
+    def ver_of(self, path): return self._by_path.get(path, (None, ""))[1]
+    def ordered_paths(self):
+        """Every path grouped by shot (sorted), newest version first inside a shot"""
+        for shot in self.shots(): yield from self.versions(shot)
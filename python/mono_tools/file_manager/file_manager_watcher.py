@@ -0,0 +1,66 @@
+# Event-driven watching for Mono File Manager (Houdini 21 / PySide6)
+# - Scene load/save/clear arrive through hou.hipFile event callbacks instead of polling hou.hipFile.name()
+# - Folder changes arrive through QFileSystemWatcher; folders the OS refuses to watch
+#   (some network mounts) fall back to a slow mtime poll
+import os
+from mono_tools.qt import QtCore
+import hou
+
+DEBOUNCE_MS=300
+POLL_FALLBACK_MS=10000
+WATCH_LIMIT=512
+
+class SceneEventWatcher(QtCore.QObject):
+    scene_changed=QtCore.Signal()
+    def __init__(self, parent=None):
+        super().__init__(parent); self._registered=False
+        self.start()
+    def _on_hip_event(self, event_type):
+        try:
+            if event_type in (hou.hipFileEventType.AfterLoad, hou.hipFileEventType.AfterSave, hou.hipFileEventType.AfterClear):
+                self.scene_changed.emit()
+        except Exception as e:
+            if os.environ.get('MONO_DEBUG'): print(f"⚠️ hip event callback error: {e}")
+    def start(self):
+        if self._registered: return
+        try: hou.hipFile.addEventCallback(self._on_hip_event); self._registered=True
+        except Exception as e: print(f"⚠️ Could not register hip file callback: {e}")
+    def stop(self):
+        if not self._registered: return
+        try: hou.hipFile.removeEventCallback(self._on_hip_event)
+        except Exception: pass
+        self._registered=False
+
+class DirectoryWatcher(QtCore.QObject):
+    """Emits changed() (debounced) when any watched folder gains, loses or renames an entry"""
+    changed=QtCore.Signal()
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fs=QtCore.QFileSystemWatcher(self); self._fs.directoryChanged.connect(self._schedule)
+        self._debounce=QtCore.QTimer(self); self._debounce.setSingleShot(True); self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.changed.emit)
+        self._polled={}  # path -> last seen mtime, for folders QFileSystemWatcher could not take
+        self._poll_timer=QtCore.QTimer(self); self._poll_timer.setInterval(POLL_FALLBACK_MS); self._poll_timer.timeout.connect(self._poll)
+    def watch(self, dirs):
+        wanted={os.path.normpath(d) for d in list(dirs)[:WATCH_LIMIT]}
+        current={os.path.normpath(d) for d in self._fs.directories()}
+        stale=[d for d in self._fs.directories() if os.path.normpath(d) not in wanted]
+        if stale: self._fs.removePaths(stale)
+        for d in [d for d in self._polled if d not in wanted]: self._polled.pop(d)
+        new=[d for d in wanted if d not in current and d not in self._polled]
+        failed=self._fs.addPaths(new) if new else []
+        for d in failed:
+            try: self._polled[os.path.normpath(d)]=os.stat(d).st_mtime
+            except OSError: pass
+        if self._polled and not self._poll_timer.isActive(): self._poll_timer.start()
+        elif not self._polled: self._poll_timer.stop()
+    def clear(self):
+        if self._fs.directories(): self._fs.removePaths(self._fs.directories())
+        self._polled.clear(); self._poll_timer.stop(); self._debounce.stop()
+    def _schedule(self, *_):
+        self._debounce.start()
+    def _poll(self):
+        for d, last in list(self._polled.items()):
+            try: m=os.stat(d).st_mtime
+            except OSError: m=None
+            if m!=last: self._polled[d]=m; self._schedule()
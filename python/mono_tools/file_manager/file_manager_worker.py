@@ -0,0 +1,133 @@
+# Background scan worker for Mono File Manager (Houdini 21 / PySide6)
+# - Scans run on a QThreadPool so the UI thread never waits on the file server
+# - Rows come back in batches through queued signals, tagged with a generation id
+# - Starting a new scan cancels the old one; batches from an older generation are dropped
+# - Version archiving (old hip -> Vers/) copies with utils.file_jobs.ArchiveWorker when a rename is not possible
+import os, time, threading
+from mono_tools.qt import QtCore
+import hou
+from mono_tools.utils.file_jobs import ArchiveSignals, ArchiveWorker
+from .file_manager_index import get_scan_index
+
+BATCH_SIZE=500
+BATCH_INTERVAL=0.1  # seconds - flush a partial batch so the table fills progressively
+
+class _ScanSignals(QtCore.QObject):
+    batch=QtCore.Signal(int, object)
+    finished=QtCore.Signal(int, int)
+    failed=QtCore.Signal(int, str)
+
+class ScanWorker(QtCore.QRunnable):
+    def __init__(self, generation, base_dir, depth, force, signals, cancel_event):
+        super().__init__()
+        self.generation=generation; self.base_dir=base_dir; self.depth=depth; self.force=force
+        self.signals=signals; self.cancel_event=cancel_event
+
+    def run(self):
+        count=0; pending=[]; last_emit=time.monotonic()
+        try:
+            scan=get_scan_index().iter_scan(self.base_dir, self.depth, self.force)
+            try:
+                for entries in scan:
+                    if self.cancel_event.is_set(): return
+                    pending.extend(entries)
+                    if len(pending)>=BATCH_SIZE or time.monotonic()-last_emit>=BATCH_INTERVAL:
+                        if pending: self.signals.batch.emit(self.generation, pending)
+                        count+=len(pending); pending=[]; last_emit=time.monotonic()
+            finally:
+                scan.close()
+            if self.cancel_event.is_set(): return
+            if pending: self.signals.batch.emit(self.generation, pending); count+=len(pending)
+            self.signals.finished.emit(self.generation, count)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+
+class ScanController(QtCore.QObject):
+    """Owns at most one live scan. Emits rows(list of FileEntry), done(count), error(message)."""
+    rows=QtCore.Signal(object)
+    done=QtCore.Signal(int)
+    error=QtCore.Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool=QtCore.QThreadPool(self); self._pool.setMaxThreadCount(2)
+        self._signals=_ScanSignals(self)
+        self._signals.batch.connect(self._on_batch)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._generation=0; self._cancel_event=None
+
+    def is_running(self):
+        return self._cancel_event is not None
+
+    def start(self, base_dir, depth=1, force=False):
+        self.cancel()
+        self._generation+=1; self._cancel_event=threading.Event()
+        self._pool.start(ScanWorker(self._generation, base_dir, depth, force, self._signals, self._cancel_event))
+        return self._generation
+
+    def cancel(self):
+        if self._cancel_event is not None:
+            self._cancel_event.set(); self._cancel_event=None
+            self._generation+=1  # anything still queued from the old worker is now stale
+
+    def _on_batch(self, generation, entries):
+        if generation==self._generation: self.rows.emit(entries)
+
+    def _on_finished(self, generation, count):
+        if generation!=self._generation: return
+        self._cancel_event=None; self.done.emit(count)
+
+    def _on_failed(self, generation, message):
+        if generation!=self._generation: return
+        self._cancel_event=None; self.error.emit(message)
+
+
+# ---------- Version archiving ----------
+def _status(text):
+    try: hou.ui.setStatusMessage(text)
+    except Exception: pass
+
+class ArchiveController(QtCore.QObject):
+    """Lives on the GUI thread: workers report through queued signals, so hou.ui is only called here.
+    Holds each job's signal object until its worker reports back."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs={}  # src -> ArchiveSignals
+
+    def start(self, src, dst):
+        signals=ArchiveSignals(self)  # owned by this (GUI-thread) object: emits from the pool are queued
+        signals.progress.connect(self._on_progress)
+        signals.finished.connect(self._on_finished)
+        signals.failed.connect(self._on_failed)
+        self._jobs[src]=signals
+        QtCore.QThreadPool.globalInstance().start(ArchiveWorker(src, dst, signals))
+
+    def _release(self, src):
+        signals=self._jobs.pop(src, None)
+        if signals is not None: signals.deleteLater()
+
+    @QtCore.Slot(str, int)
+    def _on_progress(self, src, pct):
+        _status(f"📦 Archiving {os.path.basename(src)} to Vers/… {pct}%")
+
+    @QtCore.Slot(str, str)
+    def _on_finished(self, src, dst):
+        self._release(src); _status(f"📦 {os.path.basename(src)} archived to Vers/"); print(f"📦 Archived {src} -> {dst}")
+
+    @QtCore.Slot(str, str)
+    def _on_failed(self, src, message):
+        self._release(src); _status("")
+        hou.ui.displayMessage(f"Không thể backup version cũ vào Vers/:\n{src}\n\n{message}\n\nFile gốc vẫn được giữ nguyên.", severity=hou.severityType.Warning)
+
+_archive_controller=None
+
+def archive_in_background(src, dst):
+    """Start copying src -> dst off the UI thread (call from the UI thread); progress goes to the Houdini status bar"""
+    global _archive_controller
+    if _archive_controller is None:
+        _archive_controller=ArchiveController()
+        app=QtCore.QCoreApplication.instance()
+        if app is not None and _archive_controller.thread() is not app.thread():
+            _archive_controller.moveToThread(app.thread())
+    _archive_controller.start(src, dst)
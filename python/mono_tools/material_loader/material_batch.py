@@ -0,0 +1,143 @@
+# Batch library mode for Mono Material Loader
+# 1. LibraryScanWorker (thread pool): find every texture folder under a root and parse it
+#    (texture_ingest.scan_library, directories listed in parallel).
+# 2. MaterialBuildQueue (main thread, hou is not thread-safe): build the materials in
+#    time slices so the UI stays responsive and the build can be cancelled.
+
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Callable, List
+
+import hou
+
+try:
+    from .qt import QtCore  # type: ignore
+except Exception:
+    from mono_tools.qt import QtCore  # type: ignore
+
+from .material_builder import build_material, clear_port_cache, grid_position, safe_material_name
+from .renderer_profiles import get_profile
+from .texture_ingest import scan_library
+
+# Longest build slice before control goes back to the event loop
+SLICE_MS = 50
+
+
+class LibraryScanSignals(QtCore.QObject):
+    progress = QtCore.Signal(int, int, int)     # token, folders visited, texture folders found
+    finished = QtCore.Signal(int, object)       # token, [TextureSet]
+    failed = QtCore.Signal(int, str)
+
+
+class LibraryScanWorker(QtCore.QRunnable):
+    """Runs scan_library on a pool thread; only touches the file system, never hou"""
+
+    def __init__(self, token: int, root: str, parser: Callable, signals: LibraryScanSignals):
+        super().__init__()
+        self.token = token
+        self.root = root
+        self.parser = parser
+        self.signals = signals
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        try:
+            texture_sets = scan_library(self.root, self.parser, cancelled=self.cancelled,
+                                        progress=lambda visited, found:
+                                        self.signals.progress.emit(self.token, visited, found))
+        except Exception as e:
+            self.signals.failed.emit(self.token, str(e))
+            return
+        self.signals.finished.emit(self.token, texture_sets)
+
+
+def material_jobs(texture_sets, udim: bool) -> List[tuple]:
+    """[(material name, {type: path})] for every material of every folder.
+
+    Materials without a prefix are named after their folder so names stay meaningful
+    when a whole library lands in one material library node.
+    """
+    jobs = []
+    for texture_set in texture_sets:
+        folder_name = os.path.basename(texture_set.folder)
+        for prefix, textures in texture_set.texture_paths(udim).items():
+            jobs.append((prefix or folder_name, textures))
+    return jobs
+
+
+class MaterialBuildQueue(QtCore.QObject):
+    """Build material jobs on the main thread, SLICE_MS at a time.
+
+    Cooking stays in Manual update mode for the whole queue; each slice is one undo group.
+
+    Signals:
+        progress(int, int): materials processed, total
+        finished(bool, int): cancelled, materials created
+    """
+
+    progress = QtCore.Signal(int, int)
+    finished = QtCore.Signal(bool, int)
+
+    def __init__(self, matlib_node, jobs, profile, udim: bool, position_offset=(0.0, 0.0), parent=None):
+        super().__init__(parent)
+        self.matlib_node = matlib_node
+        self.jobs = jobs
+        self.profile = get_profile(profile) if isinstance(profile, str) else profile
+        self.udim = udim
+        lib_x, lib_y = matlib_node.position()
+        self.origin = (lib_x + position_offset[0], lib_y + position_offset[1])
+        self.index = 0
+        self.created = []
+        self._previous_mode = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def start(self):
+        clear_port_cache()
+        self._previous_mode = hou.updateModeSetting()
+        hou.setUpdateMode(hou.updateMode.Manual)
+        self._timer.start()
+
+    def cancel(self):
+        if self._timer.isActive():
+            self._finish(True)
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def _finish(self, cancelled):
+        self._timer.stop()
+        if self._previous_mode is not None:
+            hou.setUpdateMode(self._previous_mode)
+            self._previous_mode = None
+        self.finished.emit(cancelled, len(self.created))
+
+    def _step(self):
+        deadline = time.perf_counter() + SLICE_MS / 1000.0
+        try:
+            with hou.undos.group(f"Create {self.profile.label} Materials"):
+                while self.index < len(self.jobs) and time.perf_counter() < deadline:
+                    mat_name, textures = self.jobs[self.index]
+                    position = grid_position(self.origin, self.index)
+                    self.index += 1
+                    try:
+                        node = build_material(self.profile, self.matlib_node, safe_material_name(mat_name),
+                                              textures, self.udim, position)
+                    except Exception as e:
+                        print(f"Error creating material {mat_name}: {e}")
+                        continue
+                    if node is not None:
+                        self.created.append(node)
+        except Exception as e:
+            print(f"⚠️ Material batch error: {e}")
+            self._finish(True)
+            return
+        self.progress.emit(self.index, len(self.jobs))
+        if self.index >= len(self.jobs):
+            self._finish(False)
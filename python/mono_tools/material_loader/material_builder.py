@@ -0,0 +1,192 @@
+# Material build engine for Mono Material Loader
+# Builds every material of a TextureSet in one undo group with cooking deferred, driven
+# by a renderer profile (renderer_profiles.py). Shader input indices are looked up once
+# per node type, and node positions are computed up front instead of calling
+# layoutChildren() on every material.
+
+from __future__ import annotations
+import re
+from typing import Dict, List, Optional, Tuple
+
+import hou
+
+from mono_tools.utils.houdini import undo_group
+from .renderer_profiles import get_profile
+
+# Material builders on a grid inside the material library, texture nodes in one column
+# to the left of the shader (network units)
+GRID_COLUMNS = 10
+GRID_SPACING = (3.0, 2.0)
+TEXTURE_COLUMN_OFFSET = 4.0
+TEXTURE_ROW_SPACING = 1.2
+VIA_COLUMN_OFFSET = 2.0
+
+_NAME_INVALID_RX = re.compile(r'[^a-zA-Z0-9_]')
+_NAME_UNDERSCORES_RX = re.compile(r'_+')
+
+
+def safe_material_name(name: str) -> str:
+    """Sanitize material name for Houdini"""
+    safe_name = _NAME_UNDERSCORES_RX.sub('_', _NAME_INVALID_RX.sub('_', name)).strip('_')
+    if not safe_name or safe_name[0].isdigit():
+        safe_name = 'mat_' + safe_name
+    return safe_name
+
+
+# ---------------------------------------------------------------------------
+# Input port lookup, cached per node type
+# ---------------------------------------------------------------------------
+_input_names: Dict[str, Tuple[str, ...]] = {}          # node type name -> lower-cased input names
+_input_index: Dict[Tuple[str, str], Optional[int]] = {}  # (node type name, port key) -> input index
+
+
+def input_index(node, port_key: str) -> Optional[int]:
+    """Index of the first input whose name contains port_key; inputNames() is read once per node type"""
+    type_name = node.type().name()
+    key = (type_name, port_key)
+    if key in _input_index:
+        return _input_index[key]
+    names = _input_names.get(type_name)
+    if names is None:
+        names = _input_names[type_name] = tuple((nm or "").lower() for nm in node.inputNames() or ())
+    index = next((i for i, nm in enumerate(names) if port_key in nm), None)
+    _input_index[key] = index
+    return index
+
+
+def clear_port_cache():
+    _input_names.clear()
+    _input_index.clear()
+
+
+# ---------------------------------------------------------------------------
+# Layout (positions computed up front)
+# ---------------------------------------------------------------------------
+def grid_position(origin: Tuple[float, float], index: int) -> Tuple[float, float]:
+    column, row = index % GRID_COLUMNS, index // GRID_COLUMNS
+    return (origin[0] + column * GRID_SPACING[0], origin[1] - row * GRID_SPACING[1])
+
+
+def texture_position(shader_position, row: int) -> Tuple[float, float]:
+    x, y = shader_position
+    return (x - TEXTURE_COLUMN_OFFSET, y - row * TEXTURE_ROW_SPACING)
+
+
+def build_materials(matlib_node, materials: Dict[str, Dict[str, str]], profile, udim: bool,
+                    position_offset=(0.0, 0.0), label: Optional[str] = None) -> List:
+    """Build every material with a renderer profile (RendererProfile or its name).
+
+    materials: material -> texture type -> path (TextureSet.texture_paths).
+    Returns the created material nodes.
+    """
+    if isinstance(profile, str):
+        profile = get_profile(profile)
+    lib_x, lib_y = matlib_node.position()
+    origin = (lib_x + position_offset[0], lib_y + position_offset[1])
+    created = []
+    with undo_group(label or f"Create {profile.label} Materials"):
+        for index, (mat_name, textures) in enumerate(materials.items()):
+            try:
+                node = build_material(profile, matlib_node, safe_material_name(mat_name), textures, udim,
+                                      grid_position(origin, index))
+            except Exception as e:
+                print(f"Error creating material {mat_name}: {e}")
+                continue
+            if node is not None:
+                created.append(node)
+                print(f"Created material: {mat_name}")
+    return created
+
+
+def _create_builder(profile, matlib_node, safe_name):
+    for node_type in profile.builder_types:
+        try:
+            return matlib_node.createNode(node_type, safe_name)
+        except Exception:
+            continue
+    return None
+
+
+def _get_or_create(builder, node_type, name):
+    node = builder.node(name)
+    if node is None:
+        node = builder.createNode(node_type, name)
+    return node
+
+
+def _set_parm(node, names, value):
+    for name in names:
+        parm = node.parm(name)
+        if parm is not None:
+            parm.set(value)
+            return True
+    return False
+
+
+def _connect(shader, port_key, node):
+    index = input_index(shader, port_key)
+    if index is not None:
+        shader.setInput(index, node, 0)
+    return index is not None
+
+
+def _build_texture(builder, shaders, built, slot, fields, tex_path, udim, position):
+    """Create the texture node(s) of one slot and wire them to the target port"""
+    node = _get_or_create(builder, slot.node_type, slot.name.format(**fields))
+    node.setPosition(position)
+    _set_parm(node, slot.path_parms, tex_path)
+    if slot.colorspace:
+        _set_parm(node, slot.colorspace_parms, slot.colorspace)
+    if udim and slot.udim_parms:
+        _set_parm(node, slot.udim_parms, 1)
+
+    out = node
+    if slot.via:
+        via_type, via_name = slot.via
+        via = _get_or_create(builder, via_type, via_name.format(**fields))
+        via.setPosition((position[0] + VIA_COLUMN_OFFSET, position[1]))
+        via.setInput(0, out, 0)
+        out = via
+    if slot.combine:
+        combine_type, combine_name, other = slot.combine
+        combine = _get_or_create(builder, combine_type, combine_name.format(**fields))
+        combine.setPosition((position[0] + VIA_COLUMN_OFFSET, position[1]))
+        if other in built:
+            combine.setInput(0, built[other], 0)
+        combine.setInput(1, out, 0)
+        out = combine
+    built[fields["canonical"]] = out
+
+    if not _connect(shaders[slot.target], slot.port, out):
+        print(f"Warning: Could not find input port '{slot.port}' for texture '{fields['ttype']}'")
+
+
+def build_material(profile, matlib_node, safe_name, textures, udim, position):
+    """One material builder with a texture node per map, wired as described by the profile"""
+    builder = _create_builder(profile, matlib_node, safe_name)
+    if builder is None:
+        print(f"Error: No valid {profile.label} node type found for {safe_name}")
+        return None
+    builder.setPosition(position)
+
+    shaders = profile.setup(builder)
+    if not shaders:
+        print(f"Warning: Could not find the {profile.label} shaders in {safe_name}")
+        return None
+
+    shader_position = shaders["surface"].position()
+    built = {}
+    row = 0
+    for ttype, tex_path in sorted(textures.items(), key=lambda item: (profile.build_order(item[0]), item[0])):
+        canonical, slot = profile.slot_for(ttype)
+        if slot is None:
+            print(f"Info: Skipping '{ttype}' - no {profile.label} mapping")
+            continue
+        fields = {"ttype": ttype, "material": safe_name, "canonical": canonical}
+        try:
+            _build_texture(builder, shaders, built, slot, fields, tex_path, udim,
+                           texture_position(shader_position, row))
+        except Exception as tex_error:
+            print(f"Warning: Could not create texture node for {ttype}: {tex_error}")
+        row += 1
+    return builder
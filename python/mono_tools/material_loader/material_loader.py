@@ -16,17 +16,24 @@ except Exception:
     # Local import path when executed as a script
     from mono_tools.qt import QtWidgets, QtCore, QtGui  # type: ignore
 
+try:
+    from .texture_ingest import get_texture_set
+    from .texture_parser import parse_texture_filename
+    from .texture_preview import PREVIEW_DEBOUNCE_MS, PreviewSignals, PreviewWorker, format_preview
+except Exception:
+    from mono_tools.material_loader.texture_ingest import get_texture_set
+    from mono_tools.material_loader.texture_parser import parse_texture_filename
+    from mono_tools.material_loader.texture_preview import PREVIEW_DEBOUNCE_MS, PreviewSignals, PreviewWorker, format_preview
+
 # Try to import backend functions from the original module if running inside Houdini
 create_usd_rs_materials_by_prefix = None
 create_karma_subnet_materials_by_prefix = None
-parse_texture_filename = None
 hou = None
 try:
     # local import to avoid failing the module when Houdini isn't present
     import Mono_MaterialLoader as backend
     create_usd_rs_materials_by_prefix = getattr(backend, 'create_usd_rs_materials_by_prefix', None)
     create_karma_subnet_materials_by_prefix = getattr(backend, 'create_karma_subnet_materials_by_prefix', None)
-    parse_texture_filename = getattr(backend, 'parse_texture_filename', None)
     try:
         import hou as _hou  # Houdini Python module
         hou = _hou
@@ -36,106 +43,9 @@ except Exception:
     # Running outside of Houdini or broken import; backend operations will be disabled.
     create_usd_rs_materials_by_prefix = None
     create_karma_subnet_materials_by_prefix = None
-    parse_texture_filename = None
     hou = None
 
 
-def _fallback_parse_texture_filename(filename: str):
-    """Best-effort parser for common PBR texture naming.
-    Returns a 5-tuple: (prefix, ttype, ext, udim, variant)
-    Example supported tokens: basecolor|albedo|diffuse, roughness, metallic|metalness,
-    normal, height|displacement, specular, emissive, opacity|transparency, ao.
-    Detects UDIM tokens: 1001-1999 or <UDIM> in name.
-    """
-    name = os.path.basename(filename)
-    stem, ext = os.path.splitext(name)
-    lower = stem.lower()
-
-    # UDIM detection
-    udim = None
-    for token in ("<udim>", "{udim}"):
-        if token in lower:
-            udim = token
-            break
-    if udim is None:
-        # 4-digit UDIM near the end
-        for part in lower.replace(".", "_").split("_"):
-            if part.isdigit() and len(part) == 4 and part.startswith("1"):
-                udim = part
-                break
-
-    # Texture type mapping
-    mapping = {
-        "basecolor": "basecolor",
-        "albedo": "basecolor",
-        "diffuse": "basecolor",
-        "color": "basecolor",
-        "col": "basecolor",
-        "base": "basecolor",
-        "roughness": "roughness",
-        "rough": "roughness",
-        "metallic": "metallic",
-        "metalness": "metallic",
-        "metal": "metallic",
-        "specular": "specular",
-        "spec": "specular",
-        "normal": "normal",
-        "nrml": "normal",
-        "nrm": "normal",
-        "bump": "height",
-        "height": "height",
-        "displacement": "height",
-        "disp": "height",
-        "emissive": "emissive",
-        "emit": "emissive",
-        "emission": "emissive",
-        "opacity": "opacity",
-        "alpha": "opacity",
-        "transparency": "opacity",
-        "trans": "opacity",
-        "ao": "occlusion",
-        "occlusion": "occlusion",
-    }
-
-    detected = None
-    token_hit = None
-    parts = lower.replace("-", "_").split("_")
-    for p in parts[::-1]:  # search from rightmost token
-        if p in mapping:
-            detected = mapping[p]
-            token_hit = p
-            break
-    if detected is None:
-        # Try suffix patterns like _bc, _r, _m, _n, _h, _d
-        suffix_map = {
-            "bc": "basecolor",
-            "r": "roughness",
-            "rough": "roughness",
-            "m": "metallic",
-            "metal": "metallic",
-            "n": "normal",
-            "norm": "normal",
-            "h": "height",
-            "d": "height",
-            "s": "specular",
-            "e": "emissive",
-            "emit": "emissive",
-            "a": "opacity",
-        }
-        last = parts[-1]
-        if last in suffix_map:
-            detected = suffix_map[last]
-
-    prefix = stem
-    variant = token_hit or ""
-    if detected is None:
-        return None
-    return (prefix, detected, ext.lstrip("."), udim or "", variant)
-
-# If backend parser is missing, use fallback
-if parse_texture_filename is None:
-    parse_texture_filename = _fallback_parse_texture_filename
-
 class SimpleMaterialLoader(QtWidgets.QWidget):
     """A minimal, modern UI for material creation.
 
@@ -154,6 +64,22 @@ class SimpleMaterialLoader(QtWidgets.QWidget):
         self.setWindowTitle("Mono Material Loader — Simple")
         self.setMinimumSize(640, 320)
 
+        # Library mode: background folder scan, then a main-thread build queue
+        self._scan_token = 0
+        self._scan_worker = None
+        self._build_queue = None
+        self._batch_progress = None
+        self._batch_args = None
+
+        # Preview: debounced while typing, scanned on a pool thread; the token drops stale results
+        self._preview_token = 0
+        self._preview_signals = PreviewSignals(self)
+        self._preview_signals.finished.connect(self._on_preview_ready)
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self._update_preview_types)
+
         self._build_ui()
 
     def _build_ui(self):
@@ -191,6 +117,10 @@ class SimpleMaterialLoader(QtWidgets.QWidget):
         self.udim_cb = QtWidgets.QCheckBox("Enable UDIM")
         self.udim_cb.setChecked(True)
         options_row.addWidget(self.udim_cb)
+        self.library_cb = QtWidgets.QCheckBox("Library mode (all subfolders)")
+        self.library_cb.setToolTip("Treat the texture folder as a library root: every subfolder with "
+                                   "textures is scanned in parallel and built into the material library.")
+        options_row.addWidget(self.library_cb)
         options_row.addStretch()
         form.addRow("Options:", options_row)
 
@@ -234,41 +164,36 @@ class SimpleMaterialLoader(QtWidgets.QWidget):
         layout.addLayout(button_row)
 
         # Signals
-        self.folder_edit.textChanged.connect(self._update_preview_types)
+        self.folder_edit.textChanged.connect(self._schedule_preview)
 
     def _on_browse(self):
         folder = QtWidgets.QFileDialog.getExistingDirectory(self, "Select texture folder")
         if folder:
             self.folder_edit.setText(os.path.normpath(folder))
 
+    def _schedule_preview(self):
+        self._preview_token += 1  # anything still in flight is stale now
+        self._preview_timer.start()
+
     def _update_preview_types(self):
         folder = self.folder_edit.text().strip()
-        types = set()
-        if folder and os.path.isdir(folder) and parse_texture_filename:
-            try:
-                entries = os.listdir(folder)
-            except Exception as e:
-                self.preview.setPlainText(f"Error reading folder: {e}")
-                return
-            sample = entries[:1000]
-            for f in sample:
-                p = os.path.join(folder, f)
-                if not os.path.isfile(p):
-                    continue
-                parsed = parse_texture_filename(f)
-                if not parsed:
-                    continue
-                try:
-                    # Accept tuples of len>=2
-                    ttype = parsed[1]
-                    if ttype:
-                        types.add(str(ttype))
-                except Exception:
-                    continue
-        if types:
-            self.preview.setPlainText("Detected texture types:\n" + "\n".join(sorted(types)))
+        self._preview_token += 1
+        if not folder:
+            self.preview.setPlainText("No texture types detected.")
+            return
+        self.preview.setPlainText("Scanning folder...")
+        worker = PreviewWorker(self._preview_token, folder, parse_texture_filename, self._preview_signals)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_preview_ready(self, token, texture_set, error):
+        if token != self._preview_token:
+            return
+        if error:
+            self.preview.setPlainText(f"Error reading folder: {error}")
+        elif texture_set is not None and len(texture_set):
+            self.preview.setPlainText(format_preview(texture_set))
         else:
-            self.preview.setPlainText("No texture types detected or parser not available.")
+            self.preview.setPlainText("No texture types detected.")
 
     def _on_create(self):
         folder = self.folder_edit.text().strip()
@@ -294,16 +219,31 @@ class SimpleMaterialLoader(QtWidgets.QWidget):
                 QtWidgets.QMessageBox.warning(self, "Material library", "Node path not found in the scene.")
                 return
 
+        if self.library_cb.isChecked():
+            if not hou:
+                QtWidgets.QMessageBox.information(self, "Not available", "Houdini Python module (hou) not found. Run this inside Houdini.")
+                return
+            self._start_library_build(folder, matlib_node, renderer, udim)
+            return
+
+        try:
+            texture_set = get_texture_set(folder, parse_texture_filename)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Folder missing", f"Error reading folder: {e}")
+            return
+
         # If backend functions are available, call them; otherwise inform the user.
         if renderer == "Redshift" and create_usd_rs_materials_by_prefix and hou:
             try:
-                create_usd_rs_materials_by_prefix(folder, matlib_node, {}, udim, position_offset=(0.0, 0.0))
+                create_usd_rs_materials_by_prefix(folder, matlib_node, {}, udim, position_offset=(0.0, 0.0),
+                    texture_set=texture_set)
                 QtWidgets.QMessageBox.information(self, "Done", "Redshift materials created (if running inside Houdini).")
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Error", str(e))
         elif renderer == "Karma" and create_karma_subnet_materials_by_prefix and hou:
             try:
-                create_karma_subnet_materials_by_prefix(folder, matlib_node, {}, udim, position_offset=(0.0, 0.0))
+                create_karma_subnet_materials_by_prefix(folder, matlib_node, {}, udim, position_offset=(0.0, 0.0),
+                    texture_set=texture_set)
                 QtWidgets.QMessageBox.information(self, "Done", "Karma materials created (if running inside Houdini).")
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Error", str(e))
@@ -317,6 +257,87 @@ class SimpleMaterialLoader(QtWidgets.QWidget):
             else:
                 QtWidgets.QMessageBox.information(self, "Not available", "Creation functions are not available in this environment.")
 
+    # ---------- Library mode ----------
+    def _start_library_build(self, folder, matlib_node, renderer, udim):
+        from .material_batch import LibraryScanSignals, LibraryScanWorker
+
+        self._scan_token += 1
+        self._batch_args = (matlib_node, renderer, udim)
+        self.create_btn.setEnabled(False)
+
+        self._batch_progress = QtWidgets.QProgressDialog("Scanning texture folders...", "Cancel", 0, 0, self)
+        self._batch_progress.setWindowTitle("Library Build")
+        self._batch_progress.setWindowModality(QtCore.Qt.WindowModal)
+        self._batch_progress.setMinimumDuration(0)
+        self._batch_progress.canceled.connect(self._cancel_library_build)
+        self._batch_progress.show()
+
+        signals = LibraryScanSignals(self)
+        signals.progress.connect(self._on_library_scan_progress)
+        signals.finished.connect(self._on_library_scanned)
+        signals.failed.connect(self._on_library_scan_failed)
+        self._scan_worker = LibraryScanWorker(self._scan_token, folder, parse_texture_filename, signals)
+        QtCore.QThreadPool.globalInstance().start(self._scan_worker)
+
+    def _cancel_library_build(self):
+        if self._scan_worker is not None:
+            self._scan_worker.cancel()
+            self._scan_worker = None
+            self._scan_token += 1  # drop the scan result when it arrives
+            self._end_library_build("Library build cancelled.")
+        elif self._build_queue is not None:
+            self._build_queue.cancel()
+
+    def _on_library_scan_progress(self, token, visited, found):
+        if token == self._scan_token and self._batch_progress is not None:
+            self._batch_progress.setLabelText(f"Scanning texture folders... {visited} folders, {found} with textures")
+
+    def _on_library_scan_failed(self, token, error):
+        if token != self._scan_token:
+            return
+        self._scan_worker = None
+        self._end_library_build(f"Error scanning library: {error}", error=True)
+
+    def _on_library_scanned(self, token, texture_sets):
+        if token != self._scan_token:
+            return
+        self._scan_worker = None
+        from .material_batch import MaterialBuildQueue, material_jobs
+
+        matlib_node, renderer, udim = self._batch_args
+        jobs = material_jobs(texture_sets, udim)
+        if not jobs:
+            self._end_library_build("No texture folders found under the library root.")
+            return
+        self._batch_progress.setLabelText(f"Building {len(jobs)} materials from {len(texture_sets)} folders...")
+        self._batch_progress.setRange(0, len(jobs))
+        self._batch_progress.setValue(0)
+        self._build_queue = MaterialBuildQueue(matlib_node, jobs, renderer, udim, parent=self)
+        self._build_queue.progress.connect(self._on_library_build_progress)
+        self._build_queue.finished.connect(self._on_library_built)
+        self._build_queue.start()
+
+    def _on_library_build_progress(self, done, total):
+        if self._batch_progress is not None:
+            self._batch_progress.setValue(done)
+
+    def _on_library_built(self, cancelled, created):
+        total = len(self._build_queue.jobs)
+        self._build_queue = None
+        state = "cancelled" if cancelled else "done"
+        self._end_library_build(f"Library build {state}: {created} of {total} materials created.")
+
+    def _end_library_build(self, message, error=False):
+        if self._batch_progress is not None:
+            self._batch_progress.canceled.disconnect(self._cancel_library_build)
+            self._batch_progress.close()
+            self._batch_progress = None
+        self.create_btn.setEnabled(True)
+        if error:
+            QtWidgets.QMessageBox.critical(self, "Error", message)
+        else:
+            QtWidgets.QMessageBox.information(self, "Library Build", message)
+
 
 def show_material_loader(parent: Optional[QtWidgets.QWidget] = None):
     """Create and show the SimpleMaterialLoader window. Returns the widget instance."""
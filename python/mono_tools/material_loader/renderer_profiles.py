@@ -0,0 +1,241 @@
+# Renderer profiles for the Mono Material Loader build engine
+# Each renderer is data: which builder node to create, which shaders it exposes and, per
+# canonical texture type, the texture node type, parm names, colorspace and target port.
+# material_builder.build_materials consumes a profile; adding a renderer means adding a
+# profile here, not another builder function.
+
+from __future__ import annotations
+import string
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .texture_parser import canonical_type as token_canonical_type
+
+RAW_COLORSPACE = "Utility - Raw"
+
+# Canonical texture types profiles can map, in build order (basecolor is built before
+# occlusion multiplies it). The parser knows a few more (specular, cavity...) which no
+# profile maps yet.
+CANONICAL_TYPES = (
+    "basecolor", "roughness", "metalness", "normal", "bump", "height",
+    "emission", "opacity", "occlusion", "coatroughness", "coatnormal",
+)
+_BUILD_ORDER = {canonical: i for i, canonical in enumerate(CANONICAL_TYPES)}
+
+# Keyword fallbacks for tokens not in texture_parser.TOKEN_TYPES, checked in order
+TYPE_KEYWORDS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (("HEIGHT", "DISPLACE", "DISP"), "height"),
+    (("NORMAL", "NRM"), "normal"),
+    (("BUMP",), "bump"),
+    (("COLOR", "ALBEDO", "DIFFUSE", "BASE"), "basecolor"),
+    (("ROUGH", "RGH"), "roughness"),
+    (("METAL",), "metalness"),
+    (("EMISS", "GLOW"), "emission"),
+    (("OPAC", "ALPHA", "TRANSPARENCY"), "opacity"),
+    (("OCCLUSION",), "occlusion"),
+)
+
+
+@lru_cache(maxsize=4096)
+def canonical_type(ttype: str) -> Optional[str]:
+    """Canonical texture type for a parsed type token, or None if unknown"""
+    canonical = token_canonical_type(ttype)
+    if canonical is not None:
+        return canonical
+    t_upper = ttype.upper()
+    for keywords, canonical in TYPE_KEYWORDS:
+        if any(x in t_upper for x in keywords):
+            return canonical
+    return None
+
+
+class TextureSlot:
+    """How one canonical texture type is built for a renderer.
+
+    name templates may use {ttype} (token from the file name), {material} and {canonical}.
+    via:     (node type, name template) inserted between the texture and the port (normal map)
+    combine: (node type, name template, canonical type) multiplying that type's node with
+             this texture before the port (ambient occlusion)
+    """
+
+    __slots__ = ("node_type", "name", "path_parms", "colorspace", "colorspace_parms", "udim_parms",
+                 "target", "port", "via", "combine")
+
+    def __init__(self, node_type: str, name: str, path_parms: Tuple[str, ...], target: str, port: str,
+                 colorspace: Optional[str] = None, colorspace_parms: Tuple[str, ...] = (),
+                 udim_parms: Tuple[str, ...] = (), via: Optional[Tuple[str, str]] = None,
+                 combine: Optional[Tuple[str, str, str]] = None):
+        self.node_type = node_type
+        self.name = name
+        self.path_parms = path_parms
+        self.colorspace = colorspace
+        self.colorspace_parms = colorspace_parms
+        self.udim_parms = udim_parms
+        self.target = target
+        self.port = port
+        self.via = via
+        self.combine = combine
+
+
+class RendererProfile:
+    """Builder node types (first that can be created wins), shader setup and texture slots"""
+
+    __slots__ = ("name", "label", "builder_types", "setup", "targets", "slots")
+
+    def __init__(self, name: str, label: str, builder_types: Tuple[str, ...],
+                 setup: Callable, targets: Tuple[str, ...], slots: Dict[str, TextureSlot]):
+        self.name = name
+        self.label = label
+        self.builder_types = builder_types
+        self.setup = setup          # setup(builder) -> {target: shader node} or None
+        self.targets = targets
+        self.slots: Mapping[str, TextureSlot] = MappingProxyType(
+            {t: slots[t] for t in CANONICAL_TYPES if t in slots})
+
+    def slot_for(self, ttype: str):
+        """(canonical type, TextureSlot or None)"""
+        canonical = canonical_type(ttype)
+        return canonical, self.slots.get(canonical) if canonical else None
+
+    def build_order(self, ttype: str) -> int:
+        return _BUILD_ORDER.get(canonical_type(ttype), len(CANONICAL_TYPES))
+
+    def validate(self) -> List[str]:
+        """Problems in the profile data (empty list when valid)"""
+        problems = []
+        if not self.builder_types:
+            problems.append("no builder node types")
+        fields = {"ttype", "material", "canonical"}
+        for canonical, slot in self.slots.items():
+            where = f"{self.name}.{canonical}"
+            if slot.target not in self.targets:
+                problems.append(f"{where}: unknown target '{slot.target}'")
+            if not slot.path_parms:
+                problems.append(f"{where}: no path parms")
+            if slot.colorspace and not slot.colorspace_parms:
+                problems.append(f"{where}: colorspace without colorspace parms")
+            templates = [slot.name] + [extra[1] for extra in (slot.via, slot.combine) if extra]
+            for template in templates:
+                used = {f for _, f, _, _ in string.Formatter().parse(template) if f}
+                if used - fields:
+                    problems.append(f"{where}: unknown name fields {sorted(used - fields)}")
+            if slot.combine and slot.combine[2] not in self.slots:
+                problems.append(f"{where}: combines with missing slot '{slot.combine[2]}'")
+            elif slot.combine and _BUILD_ORDER[slot.combine[2]] > _BUILD_ORDER[canonical]:
+                problems.append(f"{where}: combines with '{slot.combine[2]}' which is built later")
+        return problems
+
+
+# ---------------------------------------------------------------------------
+# Shader setup (the only renderer code: find or create the shaders textures connect to)
+# ---------------------------------------------------------------------------
+def _setup_redshift(builder):
+    """StandardMaterial and redshift_usd_material created by rs_usd_material_builder, one pass over children"""
+    surface = output = None
+    for child in builder.children():
+        name = child.name()
+        lower = name.lower()
+        if surface is None and (name == "StandardMaterial1" or "standardmaterial" in lower):
+            surface = child
+        elif output is None and (name == "redshift_usd_material1" or "redshift_usd_material" in lower):
+            output = child
+        if surface is not None and output is not None:
+            return {"surface": surface, "output": output}
+    return None
+
+
+def _setup_karma(builder):
+    """MaterialX builder: create output + surface; other builder types are the surface themselves"""
+    if builder.type().name() != "karma::MaterialXBuilder":
+        return {"surface": builder, "output": builder}
+    output = builder.createNode("karma::MaterialOutput")
+    output.setPosition((0, 0))
+    surface = builder.createNode("karma::Material")
+    surface.setPosition((-3, 0))
+    output.setInput(0, surface, 0)
+    return {"surface": surface, "output": output}
+
+
+def _rs_sampler(port, colorspace=None):
+    return TextureSlot("redshift::TextureSampler", "TS_{ttype}", ("tex0",), "surface", port,
+                       colorspace=colorspace, colorspace_parms=("tex0_colorSpace",),
+                       udim_parms=("udim_enable",))
+
+
+def _rs_normal(port):
+    return TextureSlot("redshift::NormalMap", "NormalMap_{ttype}", ("tex0",), "surface", port,
+                       colorspace=RAW_COLORSPACE, colorspace_parms=("tex0_colorSpace",),
+                       udim_parms=("udim_enable",))
+
+
+REDSHIFT = RendererProfile(
+    name="redshift",
+    label="Redshift",
+    builder_types=("rs_usd_material_builder",),
+    setup=_setup_redshift,
+    targets=("surface", "output"),
+    slots={
+        # color textures keep Auto colorspace, non-color textures use Raw
+        "basecolor": _rs_sampler("base_color"),
+        "roughness": _rs_sampler("refl_roughness", RAW_COLORSPACE),
+        "metalness": _rs_sampler("metalness", RAW_COLORSPACE),
+        "emission": _rs_sampler("emission_color"),
+        "opacity": _rs_sampler("opacity_color", RAW_COLORSPACE),
+        "bump": _rs_sampler("bump_input", RAW_COLORSPACE),
+        "coatroughness": _rs_sampler("coat_roughness", RAW_COLORSPACE),
+        "normal": _rs_normal("bump_input"),
+        "coatnormal": _rs_normal("coat_bump_input"),
+        "height": TextureSlot("redshift::Displacement", "RS_Displacement", ("tex0", "tex"), "output",
+                              "displacement", colorspace=RAW_COLORSPACE,
+                              colorspace_parms=("tex0_colorSpace", "tex_colorSpace"),
+                              udim_parms=("udim_enable",)),
+    },
+)
+
+
+def _karma_texture(port, target="surface", **extra):
+    return TextureSlot("karma::Texture", "{material}_{canonical}", ("filename",), target, port, **extra)
+
+
+KARMA = RendererProfile(
+    name="karma",
+    label="Karma",
+    builder_types=("karma::MaterialXBuilder", "karma::MaterialBuilder", "karma::Material"),
+    setup=_setup_karma,
+    targets=("surface", "output"),
+    slots={
+        "basecolor": _karma_texture("base_color"),
+        "roughness": _karma_texture("specular_roughness"),
+        "metalness": _karma_texture("metalness"),
+        "normal": _karma_texture("normal", via=("karma::NormalMap", "{material}_normalmap")),
+        "height": _karma_texture("displacement", target="output"),
+        "emission": _karma_texture("emission_color"),
+        "opacity": _karma_texture("opacity"),
+        "occlusion": _karma_texture("base_color",
+                                    combine=("karma::Multiply", "{material}_ao_multiply", "basecolor")),
+    },
+)
+
+
+PROFILES: Dict[str, RendererProfile] = {}
+
+
+def register_profile(profile: RendererProfile, replace: bool = False) -> RendererProfile:
+    """Add a renderer profile; raises ValueError if its data is invalid or the name is taken"""
+    if profile.name in PROFILES and not replace:
+        raise ValueError(f"Renderer profile '{profile.name}' already registered")
+    problems = profile.validate()
+    if problems:
+        raise ValueError(f"Invalid renderer profile '{profile.name}': " + "; ".join(problems))
+    PROFILES[profile.name] = profile
+    return profile
+
+
+def get_profile(name: str) -> RendererProfile:
+    """Profile by name (case-insensitive, 'Redshift' or 'redshift'); raises KeyError"""
+    return PROFILES[name.lower()]
+
+
+register_profile(REDSHIFT)
+register_profile(KARMA)
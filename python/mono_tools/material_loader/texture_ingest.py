@@ -0,0 +1,255 @@
+# Texture folder ingestion for Mono Material Loader
+# Scans a texture folder once and groups files into a TextureSet:
+#   material (prefix) -> texture type -> TextureMap (one file, or one <UDIM> pattern + its tiles)
+# UDIM tiles are grouped by their tokenized <UDIM> name, so the parser runs once per map
+# rather than once per tile. Results are cached per folder and revalidated by the folder
+# mtime, so the preview, the Redshift builder and the Karma builder all share one listing
+# + parse per change.
+
+from __future__ import annotations
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from .texture_parser import parse_texture_filename
+
+TEXTURE_EXTENSIONS = ('.exr', '.jpg', '.jpeg', '.png', '.tif', '.tiff')
+CACHE_SIZE = 512
+LIBRARY_WORKERS = 8
+UDIM_TAG = "<UDIM>"
+
+# The last UDIM tile (1001-1999) delimited by . _ or - (name.1001.exr, name_1001_BaseColor.exr,
+# name-1001.tif); other 4-digit groups (Rock_2048_Normal.png, Wood_0001_Albedo.jpg) are not tiles
+UDIM_TILE_RX = re.compile(r'(?<=[._-])1\d{3}(?=[._-]\D*\Z)')
+
+
+def tokenize_udim(name: str):
+    """(name with the tile replaced by <UDIM>, tile) or (name, None)"""
+    m = UDIM_TILE_RX.search(name)
+    if m is None:
+        return name, None
+    return name[:m.start()] + UDIM_TAG + name[m.end():], m.group()
+
+
+def udim_tag_path(path: str) -> str:
+    """Replace the tile number in the file name with <UDIM>"""
+    folder, name = os.path.split(path)
+    if UDIM_TAG in name:
+        return path
+    pattern, tile = tokenize_udim(name)
+    return path if tile is None else os.path.join(folder, pattern)
+
+
+def format_tile_range(tiles: List[str]) -> str:
+    """Sorted tiles -> "1001-1004, 1011" """
+    spans = []
+    for tile in tiles:
+        n = int(tile)
+        if spans and n == spans[-1][1] + 1:
+            spans[-1][1] = n
+        else:
+            spans.append([n, n])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in spans)
+
+
+class TextureMap:
+    """One texture map: a single file, or a <UDIM> pattern with the tiles found on disk"""
+
+    __slots__ = ("path", "tiles")
+
+    def __init__(self, path: str):
+        self.path = path    # file path, or the <UDIM> pattern path when tiles is not empty
+        self.tiles: List[str] = []
+
+    @property
+    def is_udim(self) -> bool:
+        return bool(self.tiles)
+
+    def file_path(self, udim: bool = True) -> str:
+        """<UDIM> pattern when udim is on, otherwise the first tile file"""
+        if not self.tiles or udim:
+            return self.path
+        folder, name = os.path.split(self.path)
+        return os.path.join(folder, name.replace(UDIM_TAG, self.tiles[0], 1))
+
+    def tile_range(self) -> str:
+        return format_tile_range(self.tiles)
+
+
+class TextureSet:
+    """Parsed contents of one texture folder (treat as read-only, instances are shared by the cache)"""
+
+    __slots__ = ("folder", "mtime", "parser", "materials", "files", "unparsed")
+
+    def __init__(self, folder: str, mtime: float, parser: Callable):
+        self.folder = folder
+        self.mtime = mtime
+        self.parser = parser
+        self.materials: Dict[str, Dict[str, TextureMap]] = {}
+        self.files = 0      # texture files (by extension) in the folder
+        self.unparsed = 0   # texture files the parser did not recognise
+
+    def add(self, prefix: str, ttype: str, texture_map: TextureMap) -> TextureMap:
+        """Register a map; the first map found for a material/type wins"""
+        return self.materials.setdefault(prefix, {}).setdefault(ttype, texture_map)
+
+    def texture_types(self):
+        return sorted({t for types in self.materials.values() for t in types})
+
+    def texture_paths(self, udim: bool = True) -> Dict[str, Dict[str, str]]:
+        """material -> type -> one path per map (a <UDIM> path when udim is on and the map has tiles)"""
+        return {prefix: {ttype: tmap.file_path(udim) for ttype, tmap in types.items()}
+                for prefix, types in self.materials.items()}
+
+    def __len__(self):
+        return len(self.materials)
+
+
+def scan_texture_folder(folder: str, parser: Callable = parse_texture_filename,
+                        mtime: Optional[float] = None, names=None) -> TextureSet:
+    """List the folder once (scandir) unless names is given; parse each file name once per
+    tokenized <UDIM> group. A group only counts as UDIM when the parser reports the same tile."""
+    if mtime is None:
+        mtime = os.stat(folder).st_mtime
+    if names is None:
+        names = _texture_file_names(folder)
+    texture_set = TextureSet(folder, mtime, parser)
+    groups: Dict[str, Optional[TextureMap]] = {}  # tokenized name -> map (None: not recognised)
+    not_udim = set()  # tokenized names whose tile the parser did not confirm
+    for name in names:
+        texture_set.files += 1
+        key, tile = tokenize_udim(name)
+        if tile and key in not_udim:
+            key, tile = name, None
+        if key in groups:
+            tmap = groups[key]
+        else:
+            info = parser(name)
+            if tile and info is not None and info.udim != tile:
+                not_udim.add(key)
+                key, tile = name, None
+            tmap = None
+            if info is not None:
+                tmap = TextureMap(os.path.join(folder, key if tile else name))
+                texture_set.add(info.prefix, info.ttype, tmap)
+            groups[key] = tmap
+        if tmap is None:
+            texture_set.unparsed += 1
+        elif tile:
+            tmap.tiles.append(tile)
+    for tmap in groups.values():
+        if tmap is not None:
+            tmap.tiles.sort()
+    return texture_set
+
+
+def _texture_file_names(folder: str):
+    with os.scandir(folder) as it:
+        for entry in it:
+            name = entry.name
+            if not name.lower().endswith(TEXTURE_EXTENSIONS):
+                continue
+            try:
+                if entry.is_file():
+                    yield name
+            except OSError:
+                continue
+
+
+_cache: "OrderedDict[tuple, TextureSet]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached(folder: str, parser: Callable, mtime: float) -> Optional[TextureSet]:
+    key = (folder, parser)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached.mtime == mtime:
+            _cache.move_to_end(key)
+            return cached
+    return None
+
+
+def _store(texture_set: TextureSet) -> TextureSet:
+    key = (texture_set.folder, texture_set.parser)
+    with _cache_lock:
+        _cache[key] = texture_set
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return texture_set
+
+
+def get_texture_set(folder: str, parser: Callable = parse_texture_filename) -> TextureSet:
+    """Cached TextureSet for folder; rescanned only when the folder mtime changes. Raises OSError."""
+    folder = os.path.normpath(folder)
+    mtime = os.stat(folder).st_mtime
+    cached = _cached(folder, parser, mtime)
+    if cached is not None:
+        return cached
+    return _store(scan_texture_folder(folder, parser, mtime))
+
+
+def _visit_library_dir(path: str, parser: Callable):
+    """One scandir: (TextureSet or None when path has no texture files, subdirectories)"""
+    names, subdirs = [], []
+    try:
+        mtime = os.stat(path).st_mtime
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            subdirs.append(entry.path)
+                    elif entry.name.lower().endswith(TEXTURE_EXTENSIONS):
+                        names.append(entry.name)
+                except OSError:
+                    pass
+    except OSError as e:
+        print(f"⚠️ scandir error: {e}")
+        return None, []
+    if not names:
+        return None, subdirs
+    texture_set = _cached(path, parser, mtime)
+    if texture_set is None:
+        texture_set = _store(scan_texture_folder(path, parser, mtime, names))
+    return texture_set, subdirs
+
+
+def scan_library(root: str, parser: Callable = parse_texture_filename, workers: int = LIBRARY_WORKERS,
+                 cancelled: Optional[threading.Event] = None,
+                 progress: Optional[Callable[[int, int], None]] = None) -> List[TextureSet]:
+    """TextureSets of every folder under root that has recognised textures, sorted by path.
+
+    Directories are listed and parsed on a thread pool (one scandir each, results go into
+    the folder cache). progress(folders visited, texture folders found) is called from the
+    calling thread; setting `cancelled` stops the walk and returns what was found so far.
+    """
+    found = []
+    visited = 0
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="MonoTextures")
+    try:
+        pending = {pool.submit(_visit_library_dir, os.path.normpath(root), parser)}
+        while pending and not (cancelled is not None and cancelled.is_set()):
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                texture_set, subdirs = future.result()
+                visited += 1
+                if texture_set is not None and len(texture_set):
+                    found.append(texture_set)
+                pending.update(pool.submit(_visit_library_dir, d, parser) for d in subdirs)
+            if progress is not None:
+                progress(visited, len(found))
+    finally:
+        # Cancelled: drop queued listings instead of waiting for them
+        pool.shutdown(wait=False, cancel_futures=True)
+    found.sort(key=lambda texture_set: texture_set.folder.lower())
+    return found
+
+
+def clear_texture_set_cache():
+    with _cache_lock:
+        _cache.clear()
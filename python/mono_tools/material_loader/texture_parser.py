@@ -0,0 +1,153 @@
+# Texture file name parser for Mono Material Loader
+# One compiled regex splits a file name into prefix / type token / modifiers / colorspace /
+# UDIM / extension; a frozen token table maps the type token to a canonical texture type.
+# Covers Substance Painter, Mari and Quixel Megascans export naming, e.g.
+#   Robot_Body_BaseColor.1001.png     Head_Diffuse_ACEScg.1001.exr     wood_BaseColor - ACEScg.1001.exr
+#   vfendgyiw_4K_Albedo.jpg           rock_2K_Normal_LOD0.jpg          Crate_Normal_OpenGL.png
+# Results are memoized: a folder of 100+ UDIM tiles or a library rescan parses each name once.
+# No hou / Qt imports, so batch tools and tests can use it standalone.
+
+from __future__ import annotations
+import os
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+PARSE_CACHE_SIZE = 65536
+
+# Lower-cased type token -> canonical texture type (the names renderer_profiles builds)
+TOKEN_TYPES: Mapping[str, str] = MappingProxyType({
+    # base color
+    "basecolor": "basecolor", "base_color": "basecolor", "basecolour": "basecolor",
+    "albedo": "basecolor", "diffuse": "basecolor", "diff": "basecolor",
+    "color": "basecolor", "colour": "basecolor", "col": "basecolor", "base": "basecolor",
+    "bc": "basecolor",
+    # roughness / gloss
+    "roughness": "roughness", "rough": "roughness", "rgh": "roughness", "r": "roughness",
+    "glossiness": "glossiness", "gloss": "glossiness",
+    # metal
+    "metalness": "metalness", "metallic": "metalness", "metal": "metalness", "metalnessmap": "metalness",
+    "m": "metalness",
+    # specular
+    "specular": "specular", "spec": "specular", "s": "specular",
+    # normal / bump / height
+    "normal": "normal", "normalgl": "normal", "normaldx": "normal", "normalmap": "normal",
+    "nrm": "normal", "nrml": "normal", "norm": "normal", "n": "normal",
+    "bump": "bump",
+    "height": "height", "displacement": "height", "displace": "height", "disp": "height",
+    "h": "height", "d": "height",
+    # emission
+    "emissive": "emission", "emission": "emission", "emit": "emission", "e": "emission",
+    # opacity
+    "opacity": "opacity", "alpha": "opacity", "transparency": "opacity", "trans": "opacity",
+    "a": "opacity",
+    # occlusion / cavity
+    "ao": "occlusion", "occlusion": "occlusion", "ambientocclusion": "occlusion",
+    "ambient_occlusion": "occlusion", "mixed_ao": "occlusion",
+    "cavity": "cavity",
+    # coat, sheen, subsurface, translucency
+    "coatroughness": "coatroughness", "coatnormal": "coatnormal",
+    "sheen": "sheen", "fuzz": "sheen",
+    "subsurface": "subsurface", "sss": "subsurface", "scattering": "subsurface",
+    "translucency": "translucency",
+})
+
+# Tokens allowed between the type token and the extension (normal convention, LOD, colorspace)
+_MODIFIER = r'(?:opengl|directx|ogl|gl|dx|lod\d+|var\d+|\d{1,2}bit|acescg|aces|srgb|raw|utility|linear|lin)'
+COLORSPACE_TOKENS = frozenset({"acescg", "aces", "srgb", "raw", "utility", "linear", "lin"})
+
+_SEP = r'[._\s-]'
+_TYPE = '|'.join(re.escape(t) for t in sorted(TOKEN_TYPES, key=len, reverse=True))
+
+# UDIM tiles are 1001-1999; other 4-digit groups (Rock_2048_Albedo.jpg) stay in the prefix
+# prefix  [_resolution] [_udim]  _type  [_modifiers]  [ - colorspace]  [.udim]  .ext
+TEXTURE_NAME_RX = re.compile(
+    rf'''
+    \A
+    (?:(?P<prefix>.*?)
+       (?:{_SEP}(?P<res>\d{{1,2}}k))?
+       (?:{_SEP}(?P<udim_before>1\d{{3}}))?
+       {_SEP})?
+    (?P<type>{_TYPE})
+    (?P<modifiers>(?:{_SEP}{_MODIFIER})*)
+    (?:\s-\s(?P<colorspace>[^.]+?))?
+    (?:[._-](?P<udim>1\d{{3}}|<udim>|\{{udim\}}|%\(udim\)d))?
+    \.(?P<ext>[a-z0-9]+)
+    \Z
+    ''',
+    re.IGNORECASE | re.VERBOSE,
+)
+_MODIFIER_SPLIT_RX = re.compile(_SEP)
+
+
+class TextureInfo:
+    """Parsed texture file name (shared by the cache: treat as read-only)
+
+    prefix:     material name part ("" when the name is only a type, e.g. diffuse.1001.tif)
+    ttype:      type token as written in the file name (BaseColor, Albedo, Normal...)
+    canonical:  canonical type from TOKEN_TYPES (basecolor, normal, height...)
+    udim:       "1001" / "<UDIM>" style token, or None
+    ext:        extension with the dot, lower-cased (".exr")
+    colorspace: from " - ACEScg" or a colorspace modifier token, or None
+    modifiers:  tuple of lower-cased modifier tokens (opengl, lod0...)
+    resolution: "4K" style token (Megascans), or None
+    """
+
+    __slots__ = ("filename", "prefix", "ttype", "canonical", "udim", "ext", "colorspace",
+                 "modifiers", "resolution")
+
+    def __init__(self, filename, prefix, ttype, canonical, udim, ext, colorspace, modifiers, resolution):
+        self.filename = filename
+        self.prefix = prefix
+        self.ttype = ttype
+        self.canonical = canonical
+        self.udim = udim
+        self.ext = ext
+        self.colorspace = colorspace
+        self.modifiers = modifiers
+        self.resolution = resolution
+
+    def __repr__(self):
+        return (f"TextureInfo(prefix={self.prefix!r}, ttype={self.ttype!r}, canonical={self.canonical!r}, "
+                f"udim={self.udim!r}, ext={self.ext!r}, colorspace={self.colorspace!r})")
+
+    def __eq__(self, other):
+        if not isinstance(other, TextureInfo):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __hash__(self):
+        return hash(self.filename)
+
+
+def canonical_type(token: str) -> Optional[str]:
+    """Canonical texture type of a type token (case-insensitive), or None"""
+    return TOKEN_TYPES.get(token.lower())
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_texture_filename(filename: str) -> Optional[TextureInfo]:
+    """Parse a texture file name (a path is reduced to its base name). None if no type token is found."""
+    name = os.path.basename(filename)
+    m = TEXTURE_NAME_RX.match(name)
+    if m is None:
+        return None
+    ttype = m.group("type")
+    modifiers = tuple(t.lower() for t in _MODIFIER_SPLIT_RX.split(m.group("modifiers")) if t)
+    colorspace = m.group("colorspace")
+    if colorspace is None:
+        colorspace = next((t for t in modifiers if t in COLORSPACE_TOKENS), None)
+    else:
+        colorspace = colorspace.strip()
+    return TextureInfo(
+        filename=name,
+        prefix=m.group("prefix") or "",
+        ttype=ttype,
+        canonical=TOKEN_TYPES[ttype.lower()],
+        udim=m.group("udim") or m.group("udim_before"),
+        ext="." + m.group("ext").lower(),
+        colorspace=colorspace,
+        modifiers=modifiers,
+        resolution=m.group("res"),
+    )
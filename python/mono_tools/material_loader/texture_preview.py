@@ -0,0 +1,68 @@
+# Background texture folder preview for Mono Material Loader
+# The folder scan (texture_ingest.get_texture_set, cached per folder) runs on a pool
+# thread; results carry a token so the UI can drop any result older than the latest request.
+
+from __future__ import annotations
+import os
+from typing import Callable
+
+try:
+    from .qt import QtCore  # type: ignore
+except Exception:
+    from mono_tools.qt import QtCore  # type: ignore
+
+from .texture_ingest import get_texture_set
+
+PREVIEW_DEBOUNCE_MS = 250
+PREVIEW_MAX_MATERIALS = 200
+
+
+class PreviewSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, object, str)  # token, TextureSet or None, error message
+
+
+class PreviewWorker(QtCore.QRunnable):
+    """Scan one folder off the UI thread (file system only)"""
+
+    def __init__(self, token: int, folder: str, parser: Callable, signals: PreviewSignals):
+        super().__init__()
+        self.token = token
+        self.folder = folder
+        self.parser = parser
+        self.signals = signals
+
+    def run(self):
+        if not os.path.isdir(self.folder):
+            self.signals.finished.emit(self.token, None, "")
+            return
+        try:
+            texture_set = get_texture_set(self.folder, self.parser)
+        except Exception as e:
+            self.signals.finished.emit(self.token, None, str(e))
+            return
+        self.signals.finished.emit(self.token, texture_set, "")
+
+
+def _plural(count, word):
+    return f"{count} {word}{'s' if count != 1 else ''}"
+
+
+def _map_label(ttype, tmap):
+    if not tmap.tiles:
+        return ttype
+    return f"{ttype} [{tmap.tile_range()}] ({_plural(len(tmap.tiles), 'tile')})"
+
+
+def format_preview(texture_set, max_materials: int = PREVIEW_MAX_MATERIALS) -> str:
+    """Summary line, then one line per material: map count and UDIM tile ranges per map"""
+    maps = sum(len(types) for types in texture_set.materials.values())
+    lines = [f"{_plural(len(texture_set), 'material')}, {_plural(maps, 'map')} ({_plural(texture_set.files, 'file')}"
+             + (f", {texture_set.unparsed} not recognised)" if texture_set.unparsed else ")")]
+    names = sorted(texture_set.materials, key=str.lower)
+    for name in names[:max_materials]:
+        types = texture_set.materials[name]
+        labels = ", ".join(_map_label(ttype, types[ttype]) for ttype in sorted(types, key=str.lower))
+        lines.append(f"{name or '(no prefix)'}: {_plural(len(types), 'map')} - {labels}")
+    if len(names) > max_materials:
+        lines.append(f"... and {len(names) - max_materials} more materials")
+    return "\n".join(lines)
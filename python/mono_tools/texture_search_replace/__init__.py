@@ -5,8 +5,10 @@ Texture path search and replace tools for Houdini
 
 from .texture_search_replace import show_texture_search_replace
 from .texture_menu_integration import setup_texture_tools
+from .texture_matcher import TextureMatcher
 
 __all__ = [
     'show_texture_search_replace',
-    'setup_texture_tools'
+    'setup_texture_tools',
+    'TextureMatcher'
 ]
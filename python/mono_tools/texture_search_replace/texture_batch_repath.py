@@ -0,0 +1,273 @@
+"""
+Texture Batch Repath
+Thay thế texture paths trong nhiều file .hip mà không cần mở scene trong Houdini.
+
+File .hip (ASCII) là một archive CPIO (odc, magic "070707"); giá trị string của parms
+nằm trong các entry "<node>.parm", mỗi parm một dòng `name [ ... ] ( "value" )`. Tool này
+đọc archive, thay thế chuỗi của các parm có tên giống texture parm (cùng quy tắc
+TEXTURE_KEYWORDS với GUI) bằng TextureMatcher (raw string, giữ nguyên $HIP/$JOB) và ghi
+lại entry với kích thước mới. File .hiplc/.hipnc (mã hóa) được bỏ qua.
+
+Mặc định chỉ chạy thử (dry-run) và in report; thêm --apply để ghi file.
+
+    python texture_batch_repath.py "D:/Textures/Old/" "E:/Assets/" D:/Job/shots --report repath.json
+    hython -m mono_tools.texture_search_replace.texture_batch_repath "D:/Old/" "E:/New/" shot.hip --apply
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+if __package__:
+    from .texture_matcher import TextureMatcher, is_texture_parm_name
+else:  # chạy trực tiếp bằng python, không cần import mono_tools (và hou)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from texture_matcher import TextureMatcher, is_texture_parm_name
+
+
+CPIO_MAGIC = b"070707"
+CPIO_HEADER_SIZE = 76  # odc: magic + 8 trường 6 chữ số + mtime 11 + namesize 6 + filesize 11
+CPIO_TRAILER = "TRAILER!!!"
+HIP_EXTENSIONS = ('.hip', '.cpio')
+SKIPPED_EXTENSIONS = ('.hiplc', '.hipnc')
+PARM_ENTRY_SUFFIX = ".parm"
+
+# Chuỗi trong dấu ngoặc kép, có escape \" và \\
+QUOTED_STRING_RX = re.compile(rb'"((?:[^"\\\n]|\\.)*)"')
+# Một dòng parm trong entry .parm: name [ 0 locks=0 ] ( "value" ... )
+PARM_LINE_RX = re.compile(rb'^[ \t]*([^\s\[{}]+)[ \t]*\[[^\]\n]*\][ \t]*\(.*$', re.MULTILINE)
+
+
+class HipFormatError(Exception):
+    """File không phải ASCII hip (CPIO odc)"""
+
+
+def read_cpio_entries(data):
+    """Tách archive thành list [header_fields(bytes), name(str), content(bytes)]"""
+    entries = []
+    pos = 0
+    size = len(data)
+    while pos < size:
+        header = data[pos:pos + CPIO_HEADER_SIZE]
+        if len(header) < CPIO_HEADER_SIZE or header[:6] != CPIO_MAGIC:
+            raise HipFormatError(f"Header CPIO không hợp lệ tại byte {pos}")
+        try:
+            name_size = int(header[59:65], 8)
+            file_size = int(header[65:76], 8)
+        except ValueError:
+            raise HipFormatError(f"Header CPIO không hợp lệ tại byte {pos}")
+        name_start = pos + CPIO_HEADER_SIZE
+        name = data[name_start:name_start + name_size - 1].decode('utf-8', 'surrogateescape')
+        content_start = name_start + name_size
+        content = data[content_start:content_start + file_size]
+        if len(content) != file_size:
+            raise HipFormatError(f"Entry '{name}' bị cắt ngắn")
+        entries.append([header[:65], name, content])
+        pos = content_start + file_size
+        if name == CPIO_TRAILER:
+            break
+    if not entries or entries[-1][1] != CPIO_TRAILER:
+        raise HipFormatError("Thiếu CPIO trailer")
+    return entries, data[pos:]
+
+
+def write_cpio_entries(entries, tail=b""):
+    chunks = []
+    for header, name, content in entries:
+        chunks.append(header + b"%011o" % len(content))
+        chunks.append(name.encode('utf-8', 'surrogateescape') + b"\0")
+        chunks.append(content)
+    chunks.append(tail)
+    return b"".join(chunks)
+
+
+def _decode(raw):
+    """Giải mã \\" và \\\\ trong chuỗi .parm. Trả về (value, offsets): offsets[i] là vị trí trong raw
+    của ký tự value[i] (cuối list là len(raw)). Các escape khác (\\$, \\n...) giữ nguyên 2 ký tự."""
+    if '\\' not in raw:
+        return raw, range(len(raw) + 1)
+    chars, offsets = [], []
+    i, size = 0, len(raw)
+    while i < size:
+        offsets.append(i)
+        if raw[i] == '\\' and i + 1 < size and raw[i + 1] in '"\\':
+            chars.append(raw[i + 1])
+            i += 2
+        else:
+            chars.append(raw[i])
+            i += 1
+    offsets.append(size)
+    return ''.join(chars), offsets
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def repath_parm_entry(content, matcher):
+    """Thay thế chuỗi của các texture parm trong một entry .parm.
+    Chỉ phần bị thay thế được ghi lại; bytes còn lại của chuỗi (kể cả escape như \\$F4, \\n)
+    giữ nguyên. Trả về (content mới, [(parm, old, new)])"""
+    changes = []
+
+    def substitute_line(line_match):
+        parm_name = line_match.group(1).decode('utf-8', 'surrogateescape')
+        if not is_texture_parm_name(parm_name):
+            return line_match.group(0)
+
+        def substitute(match):
+            raw = match.group(1).decode('utf-8', 'surrogateescape')
+            old_value, offsets = _decode(raw)
+            spans = matcher.replace_spans(old_value) if old_value else []
+            if not spans:
+                return match.group(0)
+            new_raw, new_value = [], []
+            raw_pos = value_pos = 0
+            for start, end, text in spans:
+                new_raw += (raw[raw_pos:offsets[start]], _escape(text))
+                new_value += (old_value[value_pos:start], text)
+                raw_pos, value_pos = offsets[end], end
+            new_raw.append(raw[raw_pos:])
+            new_value.append(old_value[value_pos:])
+            changes.append((parm_name, old_value, ''.join(new_value)))
+            return b'"' + ''.join(new_raw).encode('utf-8', 'surrogateescape') + b'"'
+
+        return QUOTED_STRING_RX.sub(substitute, line_match.group(0))
+
+    new_content = PARM_LINE_RX.sub(substitute_line, content)
+    return new_content, changes
+
+
+def backup_path_for(hip_path):
+    backup_dir = os.path.join(os.path.dirname(hip_path), "backups")
+    name, ext = os.path.splitext(os.path.basename(hip_path))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(backup_dir, f"{name}_backup_{timestamp}{ext}")
+
+
+def repath_hip_file(path, search_pattern, replace_pattern, use_regex=False, case_sensitive=False,
+                    apply=False, backup=True):
+    """Xử lý một file (chạy trong process con). Trả về report dict."""
+    report = {'file': path, 'status': 'unchanged', 'changes': []}
+    try:
+        matcher = TextureMatcher(search_pattern, replace_pattern, use_regex, case_sensitive)
+        with open(path, 'rb') as f:
+            data = f.read()
+        entries, tail = read_cpio_entries(data)
+
+        for entry in entries:
+            name = entry[1]
+            if not name.endswith(PARM_ENTRY_SUFFIX):
+                continue
+            new_content, changes = repath_parm_entry(entry[2], matcher)
+            if changes:
+                entry[2] = new_content
+                node_path = "/" + name[:-len(PARM_ENTRY_SUFFIX)]
+                report['changes'].extend({'node': node_path, 'parm': parm, 'old': old, 'new': new}
+                                         for parm, old, new in changes)
+
+        if not report['changes']:
+            return report
+        report['status'] = 'changed' if apply else 'dry-run'
+        if apply:
+            if backup:
+                report['backup'] = backup_path_for(path)
+                os.makedirs(os.path.dirname(report['backup']), exist_ok=True)
+                shutil.copy2(path, report['backup'])
+            tmp = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, 'wb') as f:
+                    f.write(write_cpio_entries(entries, tail))
+                shutil.copystat(path, tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+    except HipFormatError as e:
+        report['status'] = 'skipped'
+        report['reason'] = f"Không phải ASCII hip: {e}"
+    except (OSError, re.error) as e:
+        report['status'] = 'error'
+        report['reason'] = str(e)
+    return report
+
+
+def collect_hip_files(paths):
+    """Các file .hip/.cpio từ danh sách file/thư mục (duyệt đệ quy, bỏ qua backups/ và Vers/)"""
+    files, skipped = [], []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if d not in ("backups", "Vers") and not d.startswith('.')]
+                for name in sorted(names):
+                    ext = os.path.splitext(name)[1].lower()
+                    if ext in HIP_EXTENSIONS:
+                        files.append(os.path.join(root, name))
+                    elif ext in SKIPPED_EXTENSIONS:
+                        skipped.append(os.path.join(root, name))
+        elif os.path.splitext(path)[1].lower() in SKIPPED_EXTENSIONS:
+            skipped.append(path)
+        else:
+            files.append(path)
+    return files, skipped
+
+
+def run_batch(paths, search_pattern, replace_pattern, use_regex=False, case_sensitive=False,
+              apply=False, backup=True, jobs=None):
+    TextureMatcher(search_pattern, replace_pattern, use_regex, case_sensitive)  # báo lỗi regex trước khi chia việc
+    files, skipped = collect_hip_files(paths)
+    reports = [{'file': p, 'status': 'skipped', 'reason': "File mã hóa (.hiplc/.hipnc)", 'changes': []}
+               for p in skipped]
+    if files:
+        args = (search_pattern, replace_pattern, use_regex, case_sensitive, apply, backup)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(repath_hip_file, p, *args) for p in files]
+            reports.extend(future.result() for future in futures)
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Thay thế texture paths trong nhiều file .hip (ASCII) không cần mở Houdini")
+    parser.add_argument("search", help="pattern cần tìm")
+    parser.add_argument("replace", help="chuỗi thay thế")
+    parser.add_argument("paths", nargs="+", help="file .hip hoặc thư mục chứa .hip")
+    parser.add_argument("--regex", action="store_true", help="search là Regular Expression")
+    parser.add_argument("--case-sensitive", action="store_true", help="phân biệt hoa thường")
+    parser.add_argument("--apply", action="store_true", help="ghi thay đổi (mặc định chỉ chạy thử)")
+    parser.add_argument("--no-backup", action="store_true", help="không copy file gốc vào backups/ trước khi ghi")
+    parser.add_argument("--jobs", type=int, default=None, help="số process song song (mặc định: số CPU)")
+    parser.add_argument("--report", help="ghi report JSON ra file")
+    args = parser.parse_args(argv)
+
+    try:
+        reports = run_batch(args.paths, args.search, args.replace, args.regex, args.case_sensitive,
+                            args.apply, not args.no_backup, args.jobs)
+    except re.error as e:
+        print(f"❌ Lỗi Regular Expression: {e}")
+        return 2
+
+    counts = {}
+    for report in reports:
+        counts[report['status']] = counts.get(report['status'], 0) + 1
+        icon = {'changed': '✅', 'dry-run': '🔍', 'skipped': '⏭️', 'error': '❌'}.get(report['status'], '  ')
+        detail = f"{len(report['changes'])} thay đổi" if report['changes'] else report.get('reason', '')
+        print(f"{icon} {report['file']}: {detail}")
+    print(f"📊 {len(reports)} files • " + " • ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+    if not args.apply and counts.get('dry-run'):
+        print("💡 Dry-run - thêm --apply để ghi thay đổi")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"📝 Report: {args.report}")
+    return 1 if counts.get('error') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
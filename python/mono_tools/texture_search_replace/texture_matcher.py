@@ -0,0 +1,68 @@
+"""
+Texture Path Matcher
+Compile pattern tìm kiếm một lần và thay thế texture paths (không phụ thuộc hou)
+"""
+
+import re
+
+
+# Tên parm thường chứa texture path (chỉ xét string parms)
+TEXTURE_KEYWORDS = (
+    'tex', 'texture', 'map', 'file', 'filename', 'path',
+    'image', 'diffuse', 'normal', 'bump', 'displacement',
+    'roughness', 'metallic', 'emission', 'opacity'
+)
+
+
+def is_texture_parm_name(name):
+    """Tên parm giống texture parm (dùng chung cho GUI và batch repath)"""
+    name = name.lower()
+    return any(keyword in name for keyword in TEXTURE_KEYWORDS)
+
+
+class TextureMatcher:
+    """Search/replace engine dùng chung cho preview, apply và batch repath.
+    
+    Literal pattern được escape + IGNORECASE (nếu không phân biệt hoa thường) và
+    thay thế mọi vị trí xuất hiện. Regex được dùng nguyên bản. Kết quả được memo
+    theo value vì hàng nghìn parm thường chỉ dùng chung vài đường dẫn thư mục.
+    """
+    
+    def __init__(self, search_pattern, replace_pattern, use_regex=False, case_sensitive=False):
+        flags = 0 if case_sensitive else re.IGNORECASE
+        if use_regex:
+            self.regex = re.compile(search_pattern, flags)  # re.error nếu pattern sai
+            self.replacement = replace_pattern
+        else:
+            self.regex = re.compile(re.escape(search_pattern), flags)
+            # Literal: không diễn giải backslash hay group reference trong chuỗi thay thế
+            self.replacement = lambda match: replace_pattern
+        self._memo = {}
+    
+    def replace(self, value):
+        """Trả về value mới, hoặc None nếu không có gì thay đổi"""
+        try:
+            return self._memo[value]
+        except KeyError:
+            pass
+        new_value, count = self.regex.subn(self.replacement, value)
+        result = new_value if count and new_value != value else None
+        self._memo[value] = result
+        return result
+    
+    def replace_spans(self, value):
+        """[(start, end, text thay thế)] cho từng match trong value, [] nếu không có gì thay đổi.
+        Dùng khi chỉ được ghi lại phần bị thay thế (batch repath giữ nguyên escape gốc)."""
+        spans = []
+        changed = False
+        for match in self.regex.finditer(value):
+            if callable(self.replacement):
+                text = self.replacement(match)
+            else:
+                text = match.expand(self.replacement)
+            changed = changed or text != match.group(0)
+            spans.append((match.start(), match.end(), text))
+        return spans if changed else []
+    
+    def clear_cache(self):
+        self._memo.clear()
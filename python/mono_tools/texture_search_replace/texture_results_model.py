@@ -0,0 +1,158 @@
+"""
+Texture Search Results Model
+Bảng kết quả preview (virtualized) cho Texture Search & Replace
+"""
+
+import hou
+from PySide6 import QtCore, QtGui
+
+from .texture_validation import TextureStatus
+
+
+class TextureResultsModel(QtCore.QAbstractTableModel):
+    """Mỗi row là một change dict từ preview: node, parm, old_value, new_value, raw.
+    
+    Cột đầu là checkbox "áp dụng"; Apply chỉ dùng các row được check.
+    Chuỗi hiển thị được tạo lazily trong data() nên 100k rows vẫn nhẹ.
+    """
+    
+    COL_INCLUDE, COL_NODE, COL_PARM, COL_OLD, COL_NEW, COL_STATUS = range(6)
+    HEADERS = ["", "Node", "Parm", "Cũ", "Mới", "File mới"]
+    FILTER_ROLE = QtCore.Qt.UserRole + 1
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._changes = []
+        self._checked = []
+        self._node_paths = []
+        self._status = []  # (TextureStatus, số UDIM tiles) hoặc None khi chưa kiểm tra
+    
+    # ---- Qt model API ----
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._changes)
+    
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if index.column() == self.COL_INCLUDE:
+            flags |= QtCore.Qt.ItemIsUserCheckable
+        return flags
+    
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        change = self._changes[row]
+        if role == QtCore.Qt.CheckStateRole and col == self.COL_INCLUDE:
+            return QtCore.Qt.Checked if self._checked[row] else QtCore.Qt.Unchecked
+        if role == QtCore.Qt.DisplayRole:
+            if col == self.COL_NODE:
+                return self._node_paths[row]
+            if col == self.COL_PARM:
+                return change['parm'].name()
+            if col == self.COL_OLD:
+                return change['old_value']
+            if col == self.COL_NEW:
+                return change['new_value']
+            if col == self.COL_STATUS:
+                return self._status_text(self._status[row])
+        elif role == QtCore.Qt.ForegroundRole and col == self.COL_STATUS:
+            status = self._status[row]
+            if status and status[0] == TextureStatus.MISSING:
+                return QtGui.QBrush(QtGui.QColor("#ff6b6b"))
+        elif role == QtCore.Qt.ToolTipRole and col in (self.COL_OLD, self.COL_NEW):
+            value = change['old_value'] if col == self.COL_OLD else change['new_value']
+            return self._expanded(change, value)
+        elif role == self.FILTER_ROLE:
+            return (f"{self._node_paths[row]} {change['parm'].name()} {change['old_value']} {change['new_value']} "
+                    f"{self._status_text(self._status[row])}")
+        return None
+    
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.CheckStateRole or index.column() != self.COL_INCLUDE:
+            return False
+        self._checked[index.row()] = QtCore.Qt.CheckState(value) == QtCore.Qt.Checked
+        self.dataChanged.emit(index, index, [QtCore.Qt.CheckStateRole])
+        return True
+    
+    @staticmethod
+    def _status_text(status):
+        if status is None:
+            return ""
+        state, tiles = status
+        if state == TextureStatus.OK:
+            return f"✅ {tiles} tiles" if tiles else "✅"
+        if state == TextureStatus.MISSING:
+            return "❌ missing"
+        return "?"
+    
+    @staticmethod
+    def _expanded(change, value):
+        """Raw mode: chỉ evaluate chuỗi khi cần hiển thị tooltip"""
+        if not change.get('raw') or ('$' not in value and '`' not in value):
+            return value
+        try:
+            return f"{value}\n→ {hou.expandString(value)}"
+        except Exception:
+            return value
+    
+    # ---- Streaming ----
+    def add_changes(self, changes):
+        """Append một batch changes với một tín hiệu insert"""
+        changes = list(changes)
+        if not changes:
+            return
+        first = len(self._changes)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(changes) - 1)
+        self._changes.extend(changes)
+        self._checked.extend([True] * len(changes))
+        self._node_paths.extend(change['node'].path() for change in changes)
+        self._status.extend([None] * len(changes))
+        self.endInsertRows()
+    
+    def clear(self):
+        self.beginResetModel()
+        self._changes = []
+        self._checked = []
+        self._node_paths = []
+        self._status = []
+        self.endResetModel()
+    
+    def set_all_checked(self, checked, rows=None):
+        """Check/uncheck tất cả rows (hoặc chỉ các rows chỉ định, ví dụ rows đang hiện sau filter)"""
+        if not self._changes:
+            return
+        for row in (range(len(self._checked)) if rows is None else rows):
+            self._checked[row] = checked
+        self.dataChanged.emit(self.index(0, self.COL_INCLUDE), self.index(len(self._changes) - 1, self.COL_INCLUDE),
+                              [QtCore.Qt.CheckStateRole])
+    
+    def set_statuses(self, resolved):
+        """resolved: {check_path: (status, tiles)} - check_path là change['check_path'] hoặc new_value"""
+        if not self._changes:
+            return
+        self._status = [resolved.get(change.get('check_path', change['new_value'])) for change in self._changes]
+        self.dataChanged.emit(self.index(0, self.COL_STATUS), self.index(len(self._changes) - 1, self.COL_STATUS))
+    
+    # ---- Accessors ----
+    def changes(self):
+        return self._changes
+    
+    def checked_changes(self):
+        return [change for change, checked in zip(self._changes, self._checked) if checked]
+    
+    def checked_count(self):
+        return sum(self._checked)
+    
+    def missing_count(self, checked_only=False):
+        return sum(1 for status, checked in zip(self._status, self._checked)
+                   if status and status[0] == TextureStatus.MISSING and (checked or not checked_only))
@@ -0,0 +1,131 @@
+"""
+Texture Scene Scanner
+Quét texture parms theo từng lát thời gian trên main thread (hou không thread-safe)
+"""
+
+import re
+import time
+
+from PySide6 import QtCore
+
+# Thời gian tối đa cho mỗi lát quét trước khi trả quyền cho event loop
+SLICE_MS = 30
+
+
+class TextureScanJob(QtCore.QObject):
+    """Duyệt nodes (DFS lazy theo children()) và so khớp texture parms, mỗi lần SLICE_MS.
+    
+    Signals:
+        matches(list): batch change dicts tìm được trong một lát
+        progress(int, int): số nodes đã quét, tổng số matches
+        finished(bool): kết thúc, True nếu bị hủy
+        failed(str): lỗi khi so khớp (ví dụ group reference sai trong regex)
+    
+    Node bị xóa giữa chừng hoặc parm có expression lỗi (hou.ObjectWasDeleted,
+    hou.OperationFailed) chỉ bị bỏ qua, không dừng cả lần quét.
+    """
+    
+    matches = QtCore.Signal(object)
+    progress = QtCore.Signal(int, int)
+    finished = QtCore.Signal(bool)
+    failed = QtCore.Signal(str)
+    
+    def __init__(self, roots, matcher, find_parms, read_value, raw=False, recursive=False, parent=None):
+        super().__init__(parent)
+        self.matcher = matcher
+        self.find_parms = find_parms
+        self.read_value = read_value
+        self.raw = raw
+        self.recursive = recursive
+        self.nodes_scanned = 0
+        self.total_found = 0
+        self._stack = [iter(roots)]
+        self._cancelled = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+    
+    def start(self):
+        self._timer.start()
+    
+    def cancel(self):
+        if self._timer.isActive():
+            self._cancelled = True
+            self._timer.stop()
+            self.finished.emit(True)
+    
+    def is_running(self):
+        return self._timer.isActive()
+    
+    def _next_node(self):
+        while self._stack:
+            node = next(self._stack[-1], None)
+            if node is None:
+                self._stack.pop()
+                continue
+            if self.recursive:
+                try:
+                    self._stack.append(iter(node.children()))
+                except Exception:
+                    pass  # node đã bị xóa - bỏ qua cả nhánh con
+            return node
+        return None
+    
+    def _step(self):
+        deadline = time.perf_counter() + SLICE_MS / 1000.0
+        found = []
+        done = False
+        error = None
+        aborted = False
+        try:
+            while time.perf_counter() < deadline:
+                node = self._next_node()
+                if node is None:
+                    done = True
+                    break
+                self.nodes_scanned += 1
+                try:
+                    parms = list(self.find_parms(node))
+                except Exception:
+                    continue  # node bị xóa giữa chừng
+                for parm in parms:
+                    try:
+                        old_value = self.read_value(parm)
+                    except Exception:
+                        continue  # expression lỗi hoặc parm không còn
+                    if not old_value:
+                        continue
+                    new_value = self.matcher.replace(old_value)
+                    if new_value is not None:
+                        found.append({
+                            'node': node,
+                            'parm': parm,
+                            'old_value': old_value,
+                            'new_value': new_value,
+                            'raw': self.raw
+                        })
+        except re.error as e:
+            error = str(e)
+        except Exception as e:
+            # Lỗi không lường trước: dừng, giữ kết quả đã tìm (như khi hủy)
+            print(f"⚠️ Texture scan error: {e}")
+            aborted = True
+        finally:
+            # Matches của lát này không bị mất dù có lỗi
+            if found:
+                self.total_found += len(found)
+                self.matches.emit(found)
+        
+        if self._cancelled:
+            return  # cancel() đã được gọi từ slot của matches
+        if error is not None:
+            self._timer.stop()
+            self.failed.emit(error)
+            return
+        if aborted:
+            self.cancel()
+            return
+        self.progress.emit(self.nodes_scanned, self.total_found)
+        if done:
+            self._timer.stop()
+            self.finished.emit(False)
@@ -6,22 +6,114 @@ Công cụ tìm kiếm và thay thế đường dẫn texture trong Houdini
 import os
 import re
 import hou
-import shutil
 from datetime import datetime
 from PySide6 import QtWidgets, QtCore, QtGui
+from mono_tools.utils.file_jobs import ArchiveSignals, ArchiveWorker
+from mono_tools.utils.houdini import undo_group
+from .texture_matcher import TextureMatcher, is_texture_parm_name
+from .texture_results_model import TextureResultsModel
+from .texture_scanner import TextureScanJob
+from .texture_validation import TextureResolver, ValidationWorker, ValidationSignals
+
+
+# node type (nameWithCategory) -> (parm tuple names, regex cho multiparm instances hoặc None)
+_texture_parm_cache = {}
+
+
+def clear_texture_parm_cache():
+    """Xóa cache phân loại parm (khi HDA interface thay đổi)"""
+    _texture_parm_cache.clear()
+
+
+def is_texture_parm_template(template):
+    """String parm là file reference hoặc có tên giống texture parm"""
+    try:
+        if template.type() != hou.parmTemplateType.String:
+            return False
+        if template.stringType() == hou.stringParmType.FileReference:
+            return True
+    except Exception:
+        return False
+    return is_texture_parm_name(template.name())
+
+
+def _collect_texture_templates(templates, names, patterns):
+    for template in templates:
+        if template.type() == hou.parmTemplateType.Folder:
+            _collect_texture_templates(template.parmTemplates(), names, patterns)
+        elif is_texture_parm_template(template):
+            name = template.name()
+            if '#' in name:  # multiparm instance: file# -> file1, file2, ...
+                patterns.append(re.escape(name).replace('\\#', r'\d+'))
+            else:
+                names.append(name)
+
+
+def texture_parm_layout(node_type):
+    """Tên các parm tuple có thể chứa texture path của một node type, tính một lần từ parmTemplates()"""
+    key = node_type.nameWithCategory()
+    layout = _texture_parm_cache.get(key)
+    if layout is None:
+        names, patterns = [], []
+        _collect_texture_templates(node_type.parmTemplates(), names, patterns)
+        multi_rx = re.compile('(?:' + '|'.join(patterns) + r')\Z') if patterns else None
+        layout = _texture_parm_cache[key] = (tuple(names), multi_rx)
+    return layout
+
+
+def read_parm_value(parm, raw=False):
+    """Giá trị để so khớp: chuỗi gốc (raw) hoặc giá trị đã evaluate. Trả về None nếu parm bị bỏ qua."""
+    if not raw:
+        return parm.evalAsString()
+    try:
+        return parm.unexpandedString()
+    except hou.OperationFailed:
+        return None  # parm điều khiển bằng expression/keyframe - không ghi đè chuỗi gốc
+
+
+def apply_parm_changes(changes, pause_cooking=True):
+    """Set tất cả parms trong một undo group; tạm chuyển update mode sang Manual để không recook từng parm"""
+    applied_count = 0
+    with undo_group("Texture Search & Replace", pause_cooking=pause_cooking):
+        for change in changes:
+            try:
+                change['parm'].set(change['new_value'])
+                applied_count += 1
+            except Exception as e:
+                print(f"Lỗi khi thay đổi {change['node'].path()}.{change['parm'].name()}: {e}")
+    return applied_count
 
 
 class TextureSearchReplace(QtWidgets.QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Texture Search & Replace")
-        self.setMinimumSize(600, 500)
+        self.setMinimumSize(800, 600)
         self.setModal(True)
         
         # Backup settings
         self.backup_enabled = True
         self.backup_folder = None
         
+        # Scan đang chạy (TextureScanJob)
+        self.scan_job = None
+        
+        # Backup copy chạy trên QThreadPool; file chỉ được save khi backup xong.
+        # (applied_count, total, backup_path) trong lúc chờ. Signals không có parent để worker
+        # vẫn emit được nếu dialog bị hủy; slots của dialog (GUI thread) nhận qua queued connection.
+        self.pending_save = None
+        self.backup_signals = ArchiveSignals()
+        self.backup_signals.progress.connect(self.on_backup_progress)
+        self.backup_signals.finished.connect(self.on_backup_finished)
+        self.backup_signals.failed.connect(self.on_backup_failed)
+        
+        # Validation chạy nền; token tăng mỗi lần để bỏ kết quả cũ.
+        # Một resolver cho cả dialog: listing thư mục được giữ giữa các lần validate
+        self.validation_token = 0
+        self.texture_resolver = TextureResolver()
+        self.validation_signals = ValidationSignals(self)
+        self.validation_signals.finished.connect(self.on_validation_finished)
+        
         self.setup_ui()
         self.load_settings()
         
@@ -47,12 +139,22 @@ class TextureSearchReplace(QtWidgets.QDialog):
         
         self.case_sensitive_cb = QtWidgets.QCheckBox("Phân biệt hoa thường")
         self.use_regex_cb = QtWidgets.QCheckBox("Sử dụng Regular Expression")
+        self.raw_mode_cb = QtWidgets.QCheckBox("So khớp chuỗi gốc (giữ $HIP/$JOB và expression)")
+        self.raw_mode_cb.setToolTip("Đọc parm.unexpandedString() thay vì evaluate từng parm.\n"
+                                    "Ghi lại chuỗi gốc nên đường dẫn tương đối theo $JOB không bị mất.")
         self.backup_cb = QtWidgets.QCheckBox("Tạo backup trước khi thay đổi")
         self.backup_cb.setChecked(True)
+        self.pause_cook_cb = QtWidgets.QCheckBox("Tạm dừng cook khi áp dụng (Manual update)")
+        self.pause_cook_cb.setChecked(True)
+        self.validate_cb = QtWidgets.QCheckBox("Kiểm tra file mới có tồn tại (hỗ trợ <UDIM>)")
+        self.validate_cb.setChecked(True)
         
         options_layout.addWidget(self.case_sensitive_cb)
         options_layout.addWidget(self.use_regex_cb)
+        options_layout.addWidget(self.raw_mode_cb)
         options_layout.addWidget(self.backup_cb)
+        options_layout.addWidget(self.pause_cook_cb)
+        options_layout.addWidget(self.validate_cb)
         
         # Scope selection
         scope_group = QtWidgets.QGroupBox("Phạm vi tìm kiếm")
@@ -71,10 +173,51 @@ class TextureSearchReplace(QtWidgets.QDialog):
         results_group = QtWidgets.QGroupBox("Kết quả")
         results_layout = QtWidgets.QVBoxLayout(results_group)
         
-        self.results_text = QtWidgets.QTextEdit()
-        self.results_text.setMaximumHeight(150)
-        self.results_text.setReadOnly(True)
-        results_layout.addWidget(self.results_text)
+        self.results_model = TextureResultsModel(self)
+        self.results_proxy = QtCore.QSortFilterProxyModel(self)
+        self.results_proxy.setSourceModel(self.results_model)
+        self.results_proxy.setFilterRole(TextureResultsModel.FILTER_ROLE)
+        self.results_proxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        
+        filter_layout = QtWidgets.QHBoxLayout()
+        self.results_filter_edit = QtWidgets.QLineEdit()
+        self.results_filter_edit.setPlaceholderText("Lọc theo node, parm hoặc đường dẫn...")
+        self.results_filter_edit.setClearButtonEnabled(True)
+        self.results_filter_edit.textChanged.connect(self.results_proxy.setFilterFixedString)
+        self.check_all_btn = QtWidgets.QPushButton("Chọn tất cả")
+        self.check_all_btn.clicked.connect(lambda: self.set_visible_results_checked(True))
+        self.uncheck_all_btn = QtWidgets.QPushButton("Bỏ chọn")
+        self.uncheck_all_btn.clicked.connect(lambda: self.set_visible_results_checked(False))
+        filter_layout.addWidget(self.results_filter_edit)
+        filter_layout.addWidget(self.check_all_btn)
+        filter_layout.addWidget(self.uncheck_all_btn)
+        
+        self.results_view = QtWidgets.QTableView()
+        self.results_view.setModel(self.results_proxy)
+        self.results_view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.results_view.setWordWrap(False)
+        self.results_view.verticalHeader().setVisible(False)
+        self.results_view.verticalHeader().setDefaultSectionSize(20)
+        header = self.results_view.horizontalHeader()
+        header.setSectionResizeMode(TextureResultsModel.COL_INCLUDE, QtWidgets.QHeaderView.ResizeToContents)
+        header.setStretchLastSection(True)
+        self.results_view.setColumnWidth(TextureResultsModel.COL_NODE, 220)
+        self.results_view.setColumnWidth(TextureResultsModel.COL_PARM, 100)
+        self.results_view.setColumnWidth(TextureResultsModel.COL_OLD, 240)
+        
+        self.results_summary = QtWidgets.QLabel("")
+        self.results_model.dataChanged.connect(self.update_results_summary)
+        
+        results_layout.addLayout(filter_layout)
+        results_layout.addWidget(self.results_view)
+        results_layout.addWidget(self.results_summary)
+        
+        # Progress khi đang quét (số nodes không biết trước nên dùng busy indicator)
+        self.scan_progress = QtWidgets.QProgressBar()
+        self.scan_progress.setRange(0, 0)
+        self.scan_progress.setTextVisible(False)
+        self.scan_progress.setVisible(False)
+        results_layout.addWidget(self.scan_progress)
         
         # Buttons
         button_layout = QtWidgets.QHBoxLayout()
@@ -86,11 +229,16 @@ class TextureSearchReplace(QtWidgets.QDialog):
         self.apply_btn.clicked.connect(self.apply_changes)
         self.apply_btn.setEnabled(False)
         
+        self.cancel_scan_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_scan_btn.clicked.connect(self.cancel_scan)
+        self.cancel_scan_btn.setVisible(False)
+        
         self.close_btn = QtWidgets.QPushButton("Close")
         self.close_btn.clicked.connect(self.close)
         
         button_layout.addWidget(self.preview_btn)
         button_layout.addWidget(self.apply_btn)
+        button_layout.addWidget(self.cancel_scan_btn)
         button_layout.addStretch()
         button_layout.addWidget(self.close_btn)
         
@@ -109,7 +257,10 @@ class TextureSearchReplace(QtWidgets.QDialog):
             self.replace_pattern_edit.setText(settings.get("replace_pattern", ""))
             self.case_sensitive_cb.setChecked(settings.get("case_sensitive", False))
             self.use_regex_cb.setChecked(settings.get("use_regex", False))
+            self.raw_mode_cb.setChecked(settings.get("raw_mode", False))
             self.backup_cb.setChecked(settings.get("backup_enabled", True))
+            self.pause_cook_cb.setChecked(settings.get("pause_cooking", True))
+            self.validate_cb.setChecked(settings.get("validate_paths", True))
         except:
             pass
             
@@ -121,64 +272,60 @@ class TextureSearchReplace(QtWidgets.QDialog):
                 "replace_pattern": self.replace_pattern_edit.text(),
                 "case_sensitive": self.case_sensitive_cb.isChecked(),
                 "use_regex": self.use_regex_cb.isChecked(),
-                "backup_enabled": self.backup_cb.isChecked()
+                "raw_mode": self.raw_mode_cb.isChecked(),
+                "backup_enabled": self.backup_cb.isChecked(),
+                "pause_cooking": self.pause_cook_cb.isChecked(),
+                "validate_paths": self.validate_cb.isChecked()
             }
             hou.preferences().set("mono_texture_search_replace", settings)
         except:
             pass
     
     def get_search_scope(self):
-        """Lấy danh sách nodes để tìm kiếm dựa trên phạm vi được chọn"""
+        """Lấy (nodes gốc, có duyệt children không) dựa trên phạm vi được chọn"""
         if self.scope_selected_nodes.isChecked():
-            return hou.selectedNodes()
+            return list(hou.selectedNodes()), False
         elif self.scope_current_network.isChecked():
             current_network = hou.pwd()
-            return [current_network] if current_network else []
-        else:  # entire scene
-            return hou.node("/").allSubChildren()
+            return ([current_network] if current_network else []), False
+        else:  # entire scene - duyệt lazy thay vì allSubChildren()
+            return list(hou.node("/").children()), True
     
     def find_texture_parameters(self, node):
-        """Tìm tất cả parameters chứa texture paths trong một node"""
+        """Tìm tất cả parameters có thể chứa texture paths trong một node (không evaluate parm nào)"""
+        names, multi_rx = texture_parm_layout(node.type())
         texture_params = []
-        
-        for parm in node.parms():
-            if not parm:
-                continue
-                
-            # Check if parameter contains file path
-            parm_value = parm.evalAsString()
-            if not parm_value:
-                continue
-                
-            # Common texture parameter names
-            texture_keywords = [
-                'tex', 'texture', 'map', 'file', 'filename', 'path', 
-                'image', 'diffuse', 'normal', 'bump', 'displacement',
-                'roughness', 'metallic', 'emission', 'opacity'
-            ]
-            
-            parm_name_lower = parm.name().lower()
-            is_texture_param = any(keyword in parm_name_lower for keyword in texture_keywords)
-            
-            # Check if value looks like a file path
-            is_file_path = (
-                ('/' in parm_value or '\\' in parm_value) and
-                any(ext in parm_value.lower() for ext in ['.exr', '.jpg', '.jpeg', '.png', '.tif', '.tiff', '.hdr', '.tga'])
-            )
-            
-            if is_texture_param or is_file_path:
-                texture_params.append(parm)
+        seen = set()
+        
+        for name in names:
+            parm_tuple = node.parmTuple(name)
+            if parm_tuple is not None:
+                texture_params.extend(parm_tuple)
+        
+        if multi_rx is not None:
+            for parm_tuple in node.parmTuples():
+                if multi_rx.match(parm_tuple.name()):
+                    texture_params.extend(parm_tuple)
+        
+        # Spare parms không có trong node type
+        spare_parms = node.spareParms()
+        if spare_parms:
+            seen.update(parm.name() for parm in texture_params)
+            for parm in spare_parms:
+                if parm.name() not in seen and is_texture_parm_template(parm.parmTemplate()):
+                    texture_params.append(parm)
         
         return texture_params
     
     def create_backup(self):
-        """Tạo backup file hiện tại"""
+        """Đường dẫn backup trong backups/ cho file hiện tại (bản đã lưu trên đĩa), hoặc None.
+        Việc copy do ArchiveWorker chạy sau khi áp dụng thay đổi."""
         if not self.backup_cb.isChecked():
             return None
             
         try:
             current_file = hou.hipFile.name()
-            if not current_file or current_file == "untitled.hip":
+            if not current_file or current_file == "untitled.hip" or not os.path.exists(current_file):
                 hou.ui.displayMessage("Không thể tạo backup cho file chưa được lưu!", 
                                     severity=hou.severityType.Warning)
                 return None
@@ -195,12 +342,6 @@ class TextureSearchReplace(QtWidgets.QDialog):
             backup_filename = f"{name}_backup_{timestamp}{ext}"
             backup_path = os.path.join(backup_dir, backup_filename)
             
-            # Save current file
-            hou.hipFile.save()
-            
-            # Copy to backup
-            shutil.copy2(current_file, backup_path)
-            
             self.backup_folder = backup_dir
             return backup_path
             
@@ -219,136 +360,215 @@ class TextureSearchReplace(QtWidgets.QDialog):
                                 severity=hou.severityType.Warning)
             return
         
-        self.results_text.clear()
-        self.changes_found = []
+        self.cancel_scan()
+        self.validation_token += 1
+        self.texture_resolver.clear()  # quét lại: file trên đĩa có thể đã thay đổi
+        self.results_model.clear()
+        self.results_summary.clear()
+        self.apply_btn.setEnabled(False)
+        clear_texture_parm_cache()  # HDA interfaces có thể đã thay đổi từ lần preview trước
         
-        # Prepare search pattern
-        if self.use_regex_cb.isChecked():
-            try:
-                flags = 0 if self.case_sensitive_cb.isChecked() else re.IGNORECASE
-                search_regex = re.compile(search_pattern, flags)
-            except re.error as e:
-                hou.ui.displayMessage(f"Lỗi Regular Expression: {str(e)}", 
-                                    severity=hou.severityType.Error)
-                return
-        else:
-            search_regex = None
+        # Compile search pattern một lần
+        try:
+            matcher = TextureMatcher(search_pattern, replace_pattern,
+                                     use_regex=self.use_regex_cb.isChecked(),
+                                     case_sensitive=self.case_sensitive_cb.isChecked())
+        except re.error as e:
+            hou.ui.displayMessage(f"Lỗi Regular Expression: {str(e)}", 
+                                severity=hou.severityType.Error)
+            return
         
         # Get search scope
-        search_nodes = self.get_search_scope()
+        search_nodes, recursive = self.get_search_scope()
         if not search_nodes:
             hou.ui.displayMessage("Không tìm thấy nodes để tìm kiếm!", 
                                 severity=hou.severityType.Warning)
             return
         
-        # Search through nodes
-        total_found = 0
-        for node in search_nodes:
-            texture_params = self.find_texture_parameters(node)
-            
-            for parm in texture_params:
-                old_value = parm.evalAsString()
-                if not old_value:
-                    continue
-                
-                # Check if pattern matches
-                if search_regex:
-                    if not search_regex.search(old_value):
-                        continue
-                    new_value = search_regex.sub(replace_pattern, old_value)
-                else:
-                    if self.case_sensitive_cb.isChecked():
-                        if search_pattern not in old_value:
-                            continue
-                        new_value = old_value.replace(search_pattern, replace_pattern)
-                    else:
-                        if search_pattern.lower() not in old_value.lower():
-                            continue
-                        # Case-insensitive replacement
-                        pattern_lower = search_pattern.lower()
-                        old_lower = old_value.lower()
-                        start_idx = old_lower.find(pattern_lower)
-                        if start_idx != -1:
-                            new_value = (old_value[:start_idx] + 
-                                       replace_pattern + 
-                                       old_value[start_idx + len(search_pattern):])
-                        else:
-                            continue
-                
-                if new_value != old_value:
-                    change_info = {
-                        'node': node,
-                        'parm': parm,
-                        'old_value': old_value,
-                        'new_value': new_value
-                    }
-                    self.changes_found.append(change_info)
-                    total_found += 1
-        
-        # Display results
+        # Quét theo từng lát trên main thread - mỗi parm chỉ đọc một lần
+        raw_mode = self.raw_mode_cb.isChecked()
+        self.scan_job = TextureScanJob(search_nodes, matcher, self.find_texture_parameters,
+                                       lambda parm: read_parm_value(parm, raw_mode),
+                                       raw=raw_mode, recursive=recursive, parent=self)
+        self.scan_job.matches.connect(self.results_model.add_changes)
+        self.scan_job.progress.connect(self.on_scan_progress)
+        self.scan_job.finished.connect(self.on_scan_finished)
+        self.scan_job.failed.connect(self.on_scan_failed)
+        self.set_scanning(True)
+        self.save_settings()
+        self.scan_job.start()
+    
+    def set_scanning(self, scanning):
+        self.scan_progress.setVisible(scanning)
+        self.cancel_scan_btn.setVisible(scanning)
+        self.preview_btn.setEnabled(not scanning)
+    
+    def cancel_scan(self):
+        if self.scan_job is not None and self.scan_job.is_running():
+            self.scan_job.cancel()
+    
+    def on_scan_progress(self, nodes_scanned, total_found):
+        self.results_summary.setText(f"⏳ Đang quét... {nodes_scanned} nodes • {total_found} thay đổi")
+    
+    def on_scan_finished(self, cancelled):
+        self.set_scanning(False)
+        total_found = self.results_model.rowCount()
         if total_found == 0:
-            self.results_text.append("Không tìm thấy pattern nào phù hợp.")
+            self.results_summary.setText("Đã hủy quét." if cancelled else "Không tìm thấy pattern nào phù hợp.")
         else:
-            self.results_text.append(f"Tìm thấy {total_found} thay đổi:\n")
-            
-            for i, change in enumerate(self.changes_found[:50]):  # Limit to 50 results
-                node_path = change['node'].path()
-                parm_name = change['parm'].name()
-                old_val = change['old_value']
-                new_val = change['new_value']
-                
-                self.results_text.append(f"{i+1}. {node_path}.{parm_name}")
-                self.results_text.append(f"   Cũ: {old_val}")
-                self.results_text.append(f"   Mới: {new_val}\n")
-            
-            if total_found > 50:
-                self.results_text.append(f"... và {total_found - 50} thay đổi khác")
-        
-        self.apply_btn.setEnabled(total_found > 0)
-        self.save_settings()
+            self.update_results_summary()
+            if cancelled:
+                self.results_summary.setText(self.results_summary.text() + " (đã hủy - kết quả chưa đầy đủ)")
+        validating = bool(total_found) and self.validate_cb.isChecked()
+        self.apply_btn.setEnabled(total_found > 0 and not validating)
+        if validating:
+            self.validate_results()
+    
+    def validate_results(self):
+        """Kiểm tra các đường dẫn mới trên thread pool (gom theo thư mục, mỗi thư mục list một lần).
+        Apply bị tắt cho đến khi có kết quả để không áp dụng rows chưa có status."""
+        paths = []
+        for change in self.results_model.changes():
+            path = change['new_value']
+            if change.get('raw') and ('$' in path or '`' in path):
+                try:
+                    path = hou.expandString(path)  # hou chỉ gọi trên main thread
+                except Exception:
+                    pass
+            change['check_path'] = path
+            paths.append(path)
+        self.validation_token += 1
+        self.apply_btn.setEnabled(False)
+        QtCore.QThreadPool.globalInstance().start(
+            ValidationWorker(self.validation_token, paths, self.validation_signals, self.texture_resolver))
+        self.results_summary.setText(self.results_summary.text() + " • 🔎 đang kiểm tra file...")
+    
+    def on_validation_finished(self, token, resolved):
+        if token != self.validation_token:
+            return  # kết quả của lần preview trước
+        self.results_model.set_statuses(resolved)
+        self.update_results_summary()
+        self.apply_btn.setEnabled(self.results_model.rowCount() > 0)
+    
+    def on_scan_failed(self, message):
+        self.set_scanning(False)
+        self.results_model.clear()
+        self.results_summary.clear()
+        hou.ui.displayMessage(f"Lỗi Regular Expression: {message}", 
+                            severity=hou.severityType.Error)
+    
+    def closeEvent(self, event):
+        self.cancel_scan()
+        super().closeEvent(event)
+
+    def done(self, result):
+        # Esc / reject() không đi qua closeEvent - scan không được chạy tiếp sau khi dialog đóng
+        self.cancel_scan()
+        super().done(result)
+    
+    def update_results_summary(self, *args):
+        total = self.results_model.rowCount()
+        if total:
+            text = f"Tìm thấy {total} thay đổi • {self.results_model.checked_count()} được chọn để áp dụng"
+            missing = self.results_model.missing_count()
+            if missing:
+                text += f" • ❌ {missing} file mới không tồn tại"
+            self.results_summary.setText(text)
+    
+    def set_visible_results_checked(self, checked):
+        """Check/uncheck các rows đang hiển thị (sau filter)"""
+        rows = [self.results_proxy.mapToSource(self.results_proxy.index(r, 0)).row()
+                for r in range(self.results_proxy.rowCount())]
+        self.results_model.set_all_checked(checked, rows)
     
     def apply_changes(self):
         """Áp dụng các thay đổi đã preview"""
-        if not hasattr(self, 'changes_found') or not self.changes_found:
+        changes = self.results_model.checked_changes()
+        if not changes:
             hou.ui.displayMessage("Không có thay đổi nào để áp dụng!", 
                                 severity=hou.severityType.Warning)
             return
         
-        # Create backup
+        missing = self.results_model.missing_count(checked_only=True)
+        if missing and hou.ui.displayMessage(
+                f"{missing} đường dẫn mới không tồn tại trên đĩa.\nVẫn áp dụng thay đổi?",
+                buttons=("Áp dụng", "Hủy"), severity=hou.severityType.Warning,
+                default_choice=1, close_choice=1) != 0:
+            return
+        
+        if self.pending_save is not None:
+            hou.ui.displayMessage("Backup của lần áp dụng trước chưa xong, vui lòng chờ!",
+                                severity=hou.severityType.Warning)
+            return
+        
         backup_path = self.create_backup()
         if self.backup_cb.isChecked() and not backup_path:
             return
         
-        # Apply changes
         try:
-            hou.hipFile.save()
-            
-            applied_count = 0
-            for change in self.changes_found:
-                try:
-                    change['parm'].set(change['new_value'])
-                    applied_count += 1
-                except Exception as e:
-                    print(f"Lỗi khi thay đổi {change['node'].path()}.{change['parm'].name()}: {e}")
-            
-            # Save file after changes
-            hou.hipFile.save()
-            
-            # Show results
-            message = f"Đã áp dụng {applied_count}/{len(self.changes_found)} thay đổi thành công!"
-            if backup_path:
-                message += f"\nBackup được lưu tại: {backup_path}"
-            
-            hou.ui.displayMessage(message, severity=hou.severityType.Message)
-            
-            # Clear results
-            self.results_text.clear()
-            self.apply_btn.setEnabled(False)
-            self.changes_found = []
-            
+            applied_count = apply_parm_changes(changes, pause_cooking=self.pause_cook_cb.isChecked())
         except Exception as e:
             hou.ui.displayMessage(f"Lỗi khi áp dụng thay đổi: {str(e)}", 
                                 severity=hou.severityType.Error)
+            return
+        
+        # Clear results
+        self.results_model.clear()
+        self.results_summary.clear()
+        self.apply_btn.setEnabled(False)
+        
+        if backup_path is None:
+            self.save_after_apply(applied_count, len(changes), None)
+            return
+        
+        # Copy file trên đĩa (bản trước khi thay đổi) ở background; save khi copy xong
+        self.pending_save = (applied_count, len(changes), backup_path)
+        self.results_summary.setText(f"✅ Đã áp dụng {applied_count}/{len(changes)} thay đổi • "
+                                     "⏳ đang backup, file sẽ được lưu sau khi backup xong...")
+        QtCore.QThreadPool.globalInstance().start(
+            ArchiveWorker(hou.hipFile.name(), backup_path, self.backup_signals, move=False))
+    
+    def save_after_apply(self, applied_count, total, backup_path):
+        """Save một lần duy nhất sau khi thay đổi (và sau khi backup xong)"""
+        try:
+            if hou.hipFile.name() != "untitled.hip":
+                hou.hipFile.save()
+        except Exception as e:
+            self.results_summary.setText(f"⚠️ Đã áp dụng {applied_count}/{total} thay đổi, chưa lưu file")
+            hou.ui.displayMessage(f"Đã áp dụng thay đổi nhưng không lưu được file: {str(e)}", 
+                                severity=hou.severityType.Error)
+            return
+        message = f"Đã áp dụng {applied_count}/{total} thay đổi thành công!"
+        if backup_path:
+            message += f"\nBackup được lưu tại: {backup_path}"
+        self.results_summary.setText(f"✅ Đã áp dụng {applied_count}/{total} thay đổi và lưu file")
+        hou.ui.displayMessage(message, severity=hou.severityType.Message)
+    
+    @QtCore.Slot(str, int)
+    def on_backup_progress(self, src, percent):
+        if self.pending_save is not None:
+            applied_count, total, _ = self.pending_save
+            self.results_summary.setText(f"✅ Đã áp dụng {applied_count}/{total} thay đổi • "
+                                         f"⏳ đang backup {percent}%, file sẽ được lưu sau khi backup xong...")
+    
+    @QtCore.Slot(str, str)
+    def on_backup_finished(self, src, dst):
+        if self.pending_save is None:
+            return
+        pending, self.pending_save = self.pending_save, None
+        self.save_after_apply(*pending)
+    
+    @QtCore.Slot(str, str)
+    def on_backup_failed(self, src, message):
+        if self.pending_save is None:
+            return
+        (applied_count, total, _), self.pending_save = self.pending_save, None
+        # Thay đổi đã có trong scene nhưng file trên đĩa chưa bị ghi đè
+        self.results_summary.setText(f"⚠️ Đã áp dụng {applied_count}/{total} thay đổi, chưa lưu file "
+                                     "(backup thất bại)")
+        hou.ui.displayMessage(f"Backup thất bại nên file chưa được lưu:\n{message}\n\n"
+                            f"{applied_count} thay đổi đã được áp dụng trong scene (Undo để hoàn tác).",
+                            severity=hou.severityType.Warning)
 
 
 def show_texture_search_replace():
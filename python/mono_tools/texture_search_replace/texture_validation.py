@@ -0,0 +1,115 @@
+"""
+Texture Path Validation
+Kiểm tra texture paths có tồn tại không - mỗi thư mục chỉ scandir một lần
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6 import QtCore
+
+# <UDIM>, <udim>, %(UDIM)d
+UDIM_TOKEN_RX = re.compile(r'<udim>|%\(UDIM\)d', re.IGNORECASE)
+LIST_WORKERS = 8
+
+
+class TextureStatus:
+    OK = "ok"
+    MISSING = "missing"
+    UNKNOWN = "unknown"  # đường dẫn tương đối, op:/opdef:, còn biến chưa expand...
+
+
+class TextureResolver:
+    """Cache danh sách file theo thư mục và resolve texture paths (kể cả UDIM) từ cache.
+
+    Validate 10k parms chỉ cần vài trăm lần scandir thay vì 10k+ lần stat.
+    """
+
+    def __init__(self):
+        self._listings = {}  # normcase(dir) -> frozenset(normcase(name)) hoặc None nếu không đọc được
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _list_dir(directory):
+        try:
+            with os.scandir(directory) as it:
+                return frozenset(os.path.normcase(e.name) for e in it if not e.is_dir())
+        except OSError:
+            return None
+
+    def prefetch(self, directories):
+        """List các thư mục chưa có trong cache, song song (I/O mạng chậm)"""
+        with self._lock:
+            todo = sorted({os.path.normcase(d) for d in directories} - self._listings.keys())
+        if not todo:
+            return
+        with ThreadPoolExecutor(max_workers=min(LIST_WORKERS, len(todo))) as pool:
+            listings = list(pool.map(self._list_dir, todo))
+        with self._lock:
+            self._listings.update(zip(todo, listings))
+
+    def clear(self):
+        """Bỏ các listing đã cache (file trên đĩa có thể đã thay đổi)"""
+        with self._lock:
+            self._listings.clear()
+
+    def _listing(self, directory):
+        key = os.path.normcase(directory)
+        with self._lock:
+            if key in self._listings:
+                return self._listings[key]
+        listing = self._list_dir(key)
+        with self._lock:
+            self._listings[key] = listing
+        return listing
+
+    @staticmethod
+    def is_checkable(path):
+        return bool(path) and os.path.isabs(path) and '$' not in path and '`' not in path \
+            and not path.startswith(('op:', 'opdef:', 'oplib:'))
+
+    def resolve(self, path):
+        """(status, số UDIM tiles tìm thấy hoặc None nếu không phải UDIM path)"""
+        if not self.is_checkable(path):
+            return TextureStatus.UNKNOWN, None
+        directory, name = os.path.split(path)
+        listing = self._listing(directory)
+        if listing is None:
+            return TextureStatus.MISSING, None
+        name = os.path.normcase(name)
+        if not UDIM_TOKEN_RX.search(name):
+            return (TextureStatus.OK if name in listing else TextureStatus.MISSING), None
+        tile_rx = re.compile(r'\d{4}'.join(re.escape(part) for part in UDIM_TOKEN_RX.split(name)) + r'\Z')
+        tiles = sum(1 for candidate in listing if tile_rx.match(candidate))
+        return (TextureStatus.OK if tiles else TextureStatus.MISSING), tiles
+
+    def resolve_many(self, paths):
+        """Resolve nhiều paths: gom theo thư mục, list mỗi thư mục một lần. Trả về {path: (status, tiles)}"""
+        unique = set(paths)
+        self.prefetch(os.path.dirname(p) for p in unique if self.is_checkable(p))
+        return {p: self.resolve(p) for p in unique}
+
+
+class ValidationSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, object)
+
+
+class ValidationWorker(QtCore.QRunnable):
+    """Chạy resolve_many trên thread pool; chỉ dùng os, không gọi hou"""
+
+    def __init__(self, token, paths, signals, resolver=None):
+        super().__init__()
+        self.token = token
+        self.paths = paths
+        self.signals = signals
+        self.resolver = resolver or TextureResolver()
+
+    def run(self):
+        try:
+            result = self.resolver.resolve_many(self.paths)
+        except Exception as e:
+            print(f"⚠️ Texture validation error: {e}")
+            result = {}
+        self.signals.finished.emit(self.token, result)
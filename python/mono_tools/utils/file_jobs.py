@@ -0,0 +1,46 @@
+"""
+Mono Utilities - background file copies
+ArchiveWorker copies a file on a QThreadPool (MonoUtils.copy_file_atomic) and reports
+through ArchiveSignals. Create the signals object on the GUI thread and connect it to
+slots of a GUI-thread QObject so the results arrive as queued calls.
+"""
+import os
+
+from mono_tools.qt import QtCore
+
+from .utils import MonoUtils
+
+
+class ArchiveSignals(QtCore.QObject):
+    progress = QtCore.Signal(str, int)  # src, percent
+    finished = QtCore.Signal(str, str)  # src, dst
+    failed = QtCore.Signal(str, str)    # src, error message
+
+
+class ArchiveWorker(QtCore.QRunnable):
+    """Copy a file (temp file + rename), verify the size, then remove the original when move is set"""
+
+    def __init__(self, src, dst, signals, move=True):
+        super().__init__()
+        self.src = src
+        self.dst = dst
+        self.signals = signals
+        self.move = move
+        self._last_pct = -1
+
+    def _progress(self, done, total):
+        pct = int(done * 100 / total) if total else 100
+        if pct != self._last_pct:
+            self._last_pct = pct
+            self.signals.progress.emit(self.src, pct)
+
+    def run(self):
+        try:
+            MonoUtils.copy_file_atomic(self.src, self.dst, progress=self._progress)
+            if os.path.getsize(self.dst) != os.path.getsize(self.src):
+                raise IOError(f"Backup verify failed: {self.dst}")
+            if self.move:
+                os.remove(self.src)
+            self.signals.finished.emit(self.src, self.dst)
+        except Exception as e:
+            self.signals.failed.emit(self.src, str(e))
@@ -0,0 +1,21 @@
+"""
+Mono Utilities - Houdini scene edits
+"""
+from contextlib import contextmanager
+
+import hou
+
+
+@contextmanager
+def undo_group(label, pause_cooking=True):
+    """One undo group for the block; with pause_cooking the update mode is Manual until the
+    block exits, then the previous mode is restored (also on errors)"""
+    previous_mode = hou.updateModeSetting() if pause_cooking else None
+    if pause_cooking:
+        hou.setUpdateMode(hou.updateMode.Manual)
+    try:
+        with hou.undos.group(label):
+            yield
+    finally:
+        if previous_mode is not None:
+            hou.setUpdateMode(previous_mode)
@@ -2,6 +2,7 @@
 Mono Utilities - Common functions
 """
 import os
+import shutil
 
 class MonoUtils:
     """Utility functions for Mono Studio"""
@@ -19,4 +20,35 @@ class MonoUtils:
     @staticmethod
     def log(message):
         """Log message with Mono prefix"""
-        print(f"🎬 Mono Studio: {message}")
\ No newline at end of file
+        print(f"🎬 Mono Studio: {message}")
+    
+    @staticmethod
+    def copy_file_atomic(src, dst, progress=None, chunk_size=8 * 1024 * 1024):
+        """Copy src to dst through a temp file + rename: dst is either complete or absent.
+        progress(copied_bytes, total_bytes) is called after every chunk. Returns dst."""
+        total = os.path.getsize(src)
+        tmp = f"{dst}.{os.getpid()}.part"
+        copied = 0
+        try:
+            with open(src, "rb") as fin, open(tmp, "wb") as fout:
+                while True:
+                    chunk = fin.read(chunk_size)
+                    if not chunk:
+                        break
+                    fout.write(chunk)
+                    copied += len(chunk)
+                    if progress:
+                        progress(copied, total)
+                fout.flush()
+                os.fsync(fout.fileno())
+            shutil.copystat(src, tmp)
+            if os.path.getsize(tmp) != total:
+                raise IOError(f"Size mismatch after copy: {tmp}")
+            os.replace(tmp, dst)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return dst
@@ -0,0 +1,137 @@
+"""
+Benchmark: File Manager scan pipeline on a synthetic project tree
+Runs outside Houdini (stub hou, offscreen Qt) and prints/writes a JSON report.
+
+Tree layout: <root>/<project>/02_shots/03_lighting/...
+    depth 1  ->  03_lighting/Sh0001_lighting_v001.hip
+    depth 2  ->  03_lighting/Sh0001/Sh0001_lighting_v001.hip
+    depth 3  ->  03_lighting/Sh0001/work/Sh0001_lighting_v001.hip
+
+Usage: python python/testing/bench_file_manager_scan.py --shots 3000 --versions 5 --depth 2 --out report.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import stub_hou
+
+stub_hou.install()
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from mono_tools.qt import QtWidgets  # noqa: E402
+from mono_tools.file_manager import file_manager_helpers as helpers  # noqa: E402
+from mono_tools.file_manager.file_manager_index import ScanIndex  # noqa: E402
+from mono_tools.file_manager.file_manager_models import FileTableModel  # noqa: E402
+
+SUBPATH = os.path.join("02_shots", "03_lighting")
+
+
+def build_tree(root, shots, versions, depth, project="BENCH"):
+    """Create empty hip files; returns the scan base directory"""
+    base = os.path.join(root, project, SUBPATH)
+    for s in range(1, shots + 1):
+        shot = f"Sh{s:04d}"
+        folder = base
+        if depth >= 2:
+            folder = os.path.join(folder, shot)
+        if depth >= 3:
+            folder = os.path.join(folder, "work")
+        os.makedirs(folder, exist_ok=True)
+        for v in range(1, versions + 1):
+            open(os.path.join(folder, f"{shot}_lighting_v{v:03d}.hip"), "wb").close()
+    return base
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run_stages(base, depth, index_path):
+    stages = {}
+
+    stages["collect_files"], paths = _timed(lambda: helpers.collect_files(base, depth))
+
+    def parse():
+        helpers.parse_hip_path.cache_clear()
+        helpers._dir_info.cache_clear()
+        return [(helpers.infer_shot(p), helpers.parse_ver(os.path.basename(p))) for p in paths]
+    stages["parse_infer_shot_parse_ver"], _ = _timed(parse)
+
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    index = ScanIndex(index_path)
+    stages["index_scan_cold"], entries = _timed(lambda: index.scan(base, depth))
+    stages["index_scan_warm"], _ = _timed(lambda: ScanIndex(index_path).scan(base, depth))
+
+    rows = [(e.shot, e.ver, e.name, os.path.splitext(e.name)[1].lower(), os.path.dirname(e.path),
+             e.mtime, e.size, e.path) for e in entries]
+
+    def fill_one_by_one():
+        model = FileTableModel()
+        for r in rows:
+            model.add_row(*r)
+        return model
+    stages["model_add_row"], _ = _timed(fill_one_by_one)
+    stages["model_add_rows_bulk"], _ = _timed(lambda: FileTableModel().add_rows(rows))
+
+    from mono_tools.file_manager.file_manager_minibar import MonoFileMiniBar
+    minibar = MonoFileMiniBar(manager_factory=lambda: None)
+    shot_names = {e.path: e.shot for e in entries}
+    stages["minibar_populate"], _ = _timed(lambda: minibar.populate([e.path for e in entries], shot_names))
+    minibar.close()
+    return len(paths), stages
+
+
+def run_benchmark(shots=500, versions=5, depth=2, repeat=3):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    work = tempfile.mkdtemp(prefix="mono_bench_")
+    os.environ["HOUDINI_USER_PREF_DIR"] = work  # keep the shared scan index out of the real prefs
+    try:
+        base = build_tree(os.path.join(work, "root"), shots, versions, depth)
+        best = {}
+        files = 0
+        for _ in range(max(1, repeat)):
+            files, stages = run_stages(base, depth, os.path.join(work, "index.json"))
+            for name, secs in stages.items():
+                best[name] = min(secs, best.get(name, secs))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    app.processEvents()
+    return {
+        "config": {"shots": shots, "versions": versions, "depth": depth, "repeat": repeat},
+        "files": files,
+        "stages_ms": {name: round(secs * 1000, 3) for name, secs in best.items()},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shots", type=int, default=500)
+    parser.add_argument("--versions", type=int, default=5)
+    parser.add_argument("--depth", type=int, default=2, choices=(1, 2, 3))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the fastest is reported")
+    parser.add_argument("--out", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(sys.stderr):  # tool logs go to stderr so stdout stays valid JSON
+        report = run_benchmark(args.shots, args.versions, args.depth, args.repeat)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
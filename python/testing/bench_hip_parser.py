@@ -0,0 +1,123 @@
+"""
+Micro-benchmark: hip filename parsing (infer_shot + parse_ver) per file
+Compares the old regex cascade against the single-pass parse_hip_path on a synthetic corpus.
+
+Usage: python python/testing/bench_hip_parser.py [--count 100000]
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+
+import stub_hou
+
+stub_hou.install()
+
+from mono_tools.file_manager import file_manager_helpers as helpers  # noqa: E402
+
+# ---- Old implementation, kept verbatim for comparison ----
+_OLD_VER_RX = re.compile(r"(?:^|[_\.])v(\d{1,4})(?:[_\.]|$)", re.IGNORECASE)
+_OLD_SHOT_RX = re.compile(r'^(Sh\d+|SH\d+)', re.IGNORECASE)
+
+
+def old_infer_shot(full_path):
+    filename = os.path.basename(full_path)
+    match = _OLD_SHOT_RX.match(filename)
+    if match:
+        shot_upper = match.group(1).upper()
+        return 'Sh' + shot_upper[2:]
+    parts = os.path.normpath(full_path).split(os.sep)
+    for i, part in enumerate(parts):
+        if part in ["03_lighting", "02_animation", "01_modeling", "04_comp", "05_render"]:
+            if len(parts) > i + 1 and '.' not in parts[i + 1]:
+                return parts[i + 1]
+    name, ext = os.path.splitext(filename)
+    shot_match = re.search(r'(?:sh|shot)[-_]?(\d+)', name, re.IGNORECASE)
+    if shot_match:
+        return f"Sh{shot_match.group(1).zfill(3)}"
+    number_match = re.search(r'(\d{3,4})', name)
+    if number_match:
+        return f"Sh{number_match.group(1).zfill(3)}"
+    clean_name = re.sub(r'[_-]v\d+.*$', '', name)
+    clean_name = re.sub(r'[_-].*$', '', clean_name)
+    if clean_name and len(clean_name) > 2:
+        return clean_name[:10]
+    return "Unknown"
+
+
+def old_parse_ver(name):
+    m = _OLD_VER_RX.search(name)
+    return f"v{int(m.group(1)):03d}" if m else ""
+
+
+def make_corpus(count, seed=7):
+    """Synthetic paths: flat lighting folders, per-shot folders and free-form names"""
+    rnd = random.Random(seed)
+    root = os.path.join("D:" + os.sep, "Job", "Proj")
+    flat = os.path.join(root, "02_shots", "03_lighting")
+    notes = ["", "_fix", "_fog_pass", "_client_notes"]
+    paths = []
+    for i in range(count):
+        shot = rnd.randint(1, 3000)
+        ver = rnd.randint(1, 120)
+        kind = i % 4
+        if kind == 0:
+            paths.append(os.path.join(flat, f"Sh{shot:04d}_lighting_v{ver:03d}{rnd.choice(notes)}.hip"))
+        elif kind == 1:
+            paths.append(os.path.join(flat, f"Sh{shot:04d}", f"lgt_v{ver:03d}.hiplc"))
+        elif kind == 2:
+            paths.append(os.path.join(root, "work", f"shot_{shot}_comp_v{ver:03d}.hipnc"))
+        else:
+            paths.append(os.path.join(root, "work", f"lookdev{rnd.choice(notes)}.v{ver}.hip"))
+    return paths
+
+
+def _time(fn, paths):
+    start = time.perf_counter()
+    for p in paths:
+        fn(p)
+    return time.perf_counter() - start
+
+
+def run_benchmark(count=100000):
+    paths = make_corpus(count)
+
+    def old(p):
+        return old_infer_shot(p), old_parse_ver(os.path.basename(p))
+
+    def new(p):
+        info = helpers.parse_hip_path(p)
+        return info.shot, info.ver
+
+    helpers.parse_hip_path.cache_clear()
+    helpers._dir_info.cache_clear()
+    t_old = _time(old, paths)
+    t_new_cold = _time(new, paths)
+    t_new_warm = _time(new, paths)
+
+    # Shots may differ only where the old cascade read version digits as a shot number
+    mismatched = sum(1 for p in paths if old(p) != new(p))
+    return {
+        "files": count,
+        "old_us_per_file": round(t_old / count * 1e6, 3),
+        "new_us_per_file_cold": round(t_new_cold / count * 1e6, 3),
+        "new_us_per_file_cached": round(t_new_warm / count * 1e6, 3),
+        "speedup_cold": round(t_old / t_new_cold, 2) if t_new_cold else None,
+        "mismatched": mismatched,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+    print("Mono Studio - Hip Parser Benchmark")
+    print("=" * 40)
+    for key, value in run_benchmark(args.count).items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark: Material Loader build engine against fake Houdini nodes
+Runs outside Houdini (stub hou) and prints/writes a JSON report with the build time per
+material count, so linear scaling (flat ms/material) is easy to check.
+
+The fake nodes only record what the engine does; they cost next to nothing, so the
+numbers measure the engine's own Python overhead and the number of hou calls it makes
+(inputNames() reads, createNode, setInput).
+
+Usage: python python/testing/bench_material_build.py --materials 50 100 200 400 --maps 6 --renderer redshift karma --out report.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+from collections import Counter
+
+import stub_hou
+
+stub_hou.install()
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from mono_tools.material_loader import material_builder  # noqa: E402
+from mono_tools.material_loader.renderer_profiles import PROFILES  # noqa: E402
+
+MAP_TYPES = ("BaseColor", "Roughness", "Metalness", "Normal", "Height", "Opacity", "Emissive", "AO")
+
+# Input names of the shaders the profiles connect to
+FAKE_INPUTS = {
+    "redshift::StandardMaterial": ("base_color", "base_color_weight", "refl_roughness", "metalness",
+                                   "opacity_color", "emission_color", "bump_input", "coat_bump_input"),
+    "redshift_usd_material": ("shader", "displacementShader", "volumeShader"),
+    "karma::Material": ("base", "base_color", "diffuse_roughness", "metalness", "specular_roughness",
+                        "emission_color", "opacity", "normal"),
+    "karma::MaterialOutput": ("surface", "displacement", "volume"),
+}
+DEFAULT_CHILDREN = (("StandardMaterial1", "redshift::StandardMaterial"),
+                    ("redshift_usd_material1", "redshift_usd_material"))
+
+calls = Counter()
+
+
+class FakeParm:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = None
+
+    def set(self, value):
+        calls["parm.set"] += 1
+        self.value = value
+
+
+class FakeType:
+    __slots__ = ("_name",)
+
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class FakeNode:
+    PARMS = ("tex0", "tex0_colorSpace", "udim_enable", "filename")
+
+    def __init__(self, name, type_name, parent=None):
+        self._name = name
+        self._type = FakeType(type_name)
+        self._children = {}
+        self._inputs = {}
+        self._parms = {p: FakeParm() for p in self.PARMS}
+        self._position = (0.0, 0.0)
+        if type_name == "rs_usd_material_builder":
+            for child_name, child_type in DEFAULT_CHILDREN:
+                self._children[child_name] = FakeNode(child_name, child_type, self)
+
+    def name(self):
+        return self._name
+
+    def type(self):
+        return self._type
+
+    def createNode(self, type_name, name=None):
+        calls["createNode"] += 1
+        name = name or f"{type_name.split(':')[-1]}{len(self._children) + 1}"
+        node = self._children[name] = FakeNode(name, type_name, self)
+        return node
+
+    def node(self, name):
+        return self._children.get(name)
+
+    def children(self):
+        return tuple(self._children.values())
+
+    def parm(self, name):
+        return self._parms.get(name)
+
+    def inputNames(self):
+        calls["inputNames"] += 1
+        return FAKE_INPUTS.get(self._type.name(), ())
+
+    def setInput(self, index, node, output=0):
+        calls["setInput"] += 1
+        self._inputs[index] = (node, output)
+
+    def position(self):
+        return self._position
+
+    def setPosition(self, position):
+        self._position = tuple(position)
+
+    def layoutChildren(self, *args, **kwargs):
+        calls["layoutChildren"] += 1
+
+
+def make_materials(count, maps):
+    return {f"asset{m:04d}": {t: f"/tex/asset{m:04d}_{t}.<UDIM>.exr" for t in MAP_TYPES[:maps]}
+            for m in range(count)}
+
+
+def run_size(renderer, count, maps, repeat):
+    materials = make_materials(count, maps)
+    best = None
+    for _ in range(max(1, repeat)):
+        material_builder.clear_port_cache()
+        calls.clear()
+        matlib = FakeNode("materiallibrary1", "materiallibrary")
+        start = time.perf_counter()
+        created = material_builder.build_materials(matlib, materials, renderer, udim=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "renderer": renderer,
+        "materials": count,
+        "created": len(created),
+        "total_ms": round(best * 1000, 3),
+        "ms_per_material": round(best * 1000 / max(1, count), 4),
+        "calls": dict(sorted(calls.items())),
+    }
+
+
+def run_benchmark(sizes=(50, 100, 200, 400), maps=6, repeat=3, renderers=("redshift",)):
+    results = [run_size(r, n, maps, repeat) for r in renderers for n in sizes]
+    return {
+        "config": {"renderers": list(renderers), "sizes": list(sizes), "maps": maps, "repeat": repeat},
+        "results": results,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--materials", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--maps", type=int, default=6, choices=range(1, len(MAP_TYPES) + 1),
+                        help="texture maps per material")
+    parser.add_argument("--renderer", nargs="+", default=sorted(PROFILES), choices=sorted(PROFILES),
+                        help="renderer profiles to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the fastest is reported")
+    parser.add_argument("--out", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(sys.stderr):  # build logs go to stderr so stdout stays valid JSON
+        report = run_benchmark(args.materials, args.maps, args.repeat, args.renderer)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: Material Loader texture file name parser on 100k synthetic names
+Runs outside Houdini and prints/writes a JSON report. texture_parser has no hou/Qt
+imports, so it is loaded straight from its folder instead of through mono_tools.
+
+Names mix Substance Painter, Mari and Quixel Megascans conventions, with and without
+UDIM tiles, plus a share of non-texture names the parser must reject. Like repeated
+preview / library rescans, the lookups are drawn from a smaller set of unique names
+(--unique, kept below texture_parser.PARSE_CACHE_SIZE), so the report shows what the
+memoization saves: "parse_uncached" runs the regex for every lookup, "parse_cold" starts
+from an empty cache and "parse_warm_cached" only hits the cache; cache hits/misses per stage.
+
+Usage: python python/testing/bench_texture_parser.py --names 100000 --unique 20000 --out report.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "mono_tools", "material_loader"))
+import texture_parser  # noqa: E402
+
+TEMPLATES = (
+    "{asset}_{mat}_{stype}.{udim}.png",             # Substance Painter (UDIM)
+    "{asset}_{stype}.png",                          # Substance Painter
+    "{asset}_{mtype}_ACEScg.{udim}.exr",            # Mari with colorspace token
+    "{asset}_{mtype} - ACEScg.{udim}.exr",          # Mari " - colorspace"
+    "{mtype}.{udim}.tif",                           # Mari channel only
+    "{qid}_{res}_{qtype}.jpg",                      # Quixel Megascans
+    "{qid}_{res}_{qtype}_LOD{lod}.jpg",             # Quixel Megascans LOD
+    "{asset}_notes_v{lod}.png",                     # not a texture map
+)
+SUBSTANCE_TYPES = ("BaseColor", "Roughness", "Metallic", "Normal", "Height", "Emissive", "Opacity",
+                   "Mixed_AO", "Normal_OpenGL")
+MARI_TYPES = ("Diffuse", "Specular", "Roughness", "Bump", "Displacement", "Normal")
+QUIXEL_TYPES = ("Albedo", "Roughness", "Normal", "Displacement", "AO", "Cavity", "Gloss", "Translucency")
+
+
+def make_unique_names(unique, rng):
+    names = set()
+    i = 0
+    while len(names) < unique:
+        template = TEMPLATES[i % len(TEMPLATES)]
+        names.add(template.format(
+            asset=f"Asset{rng.randrange(2000):04d}", mat=rng.choice(("Body", "Head", "Cloth")),
+            stype=rng.choice(SUBSTANCE_TYPES), mtype=rng.choice(MARI_TYPES), qtype=rng.choice(QUIXEL_TYPES),
+            qid="".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(9)),
+            res=rng.choice(("1K", "2K", "4K", "8K")), lod=rng.randrange(4), udim=1001 + rng.randrange(40)))
+        i += 1
+    return sorted(names)
+
+
+def make_names(count, unique, seed=1):
+    """count lookups drawn from `unique` distinct names: every name at least once, then repeats"""
+    rng = random.Random(seed)
+    pool = make_unique_names(min(unique, count), rng)
+    names = pool + [rng.choice(pool) for _ in range(count - len(pool))]
+    rng.shuffle(names)
+    return names
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _cache_stats(parse, before):
+    info = parse.cache_info()
+    hits, misses = info.hits - before.hits, info.misses - before.misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / max(1, hits + misses), 4),
+            "size": info.currsize}
+
+
+def run_benchmark(count=100000, unique=20000, repeat=3):
+    names = make_names(count, unique)
+    parse = texture_parser.parse_texture_filename
+    uncached = parse.__wrapped__
+    best = {}
+    cache = {}
+    parsed = 0
+    for _ in range(max(1, repeat)):
+        stages = {}
+        stages["parse_uncached"], parsed = _timed(lambda: sum(1 for n in names if uncached(n) is not None))
+        parse.cache_clear()
+        before = parse.cache_info()
+        stages["parse_cold"], _ = _timed(lambda: sum(1 for n in names if parse(n) is not None))
+        cache["parse_cold"] = _cache_stats(parse, before)
+        before = parse.cache_info()
+        stages["parse_warm_cached"], _ = _timed(lambda: sum(1 for n in names if parse(n) is not None))
+        cache["parse_warm_cached"] = _cache_stats(parse, before)
+        stages["regex_match_only"], _ = _timed(
+            lambda: sum(1 for n in names if texture_parser.TEXTURE_NAME_RX.match(n)))
+        for name, secs in stages.items():
+            best[name] = min(secs, best.get(name, secs))
+    unique_names = len(set(names))
+    return {
+        "config": {"names": count, "unique": unique_names, "repeat": repeat,
+                   "cache_max": texture_parser.PARSE_CACHE_SIZE,
+                   "fits_cache": unique_names <= texture_parser.PARSE_CACHE_SIZE},
+        "parsed": parsed,
+        "rejected": count - parsed,
+        "stages_ms": {name: round(secs * 1000, 3) for name, secs in best.items()},
+        "names_per_sec_uncached": round(count / best["parse_uncached"]),
+        "names_per_sec_cold": round(count / best["parse_cold"]),
+        "names_per_sec_warm": round(count / best["parse_warm_cached"]),
+        "cache": cache,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--names", type=int, default=100000, help="parse lookups")
+    parser.add_argument("--unique", type=int, default=20000,
+                        help="distinct names the lookups are drawn from (rescans repeat names)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the fastest is reported")
+    parser.add_argument("--out", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.names, args.unique, args.repeat)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Minimal stand-in for the `hou` module so benchmarks can run mono_tools outside Houdini.
+Only installed when the real hou is not importable. It covers what the file manager
+touches at import/construct time: hou.qt, hou.ui, hou.hipFile, severity/event enums
+and the user pref dir lookups (read from the environment), plus hou.undos and the
+update mode calls used by the material build engine.
+"""
+
+import contextlib
+import os
+import sys
+import types
+
+
+class _Enum:
+    """Attribute access returns a stable sentinel string, e.g. severityType.Warning"""
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, item):
+        return f"{self._name}.{item}"
+
+
+class _Qt:
+    @staticmethod
+    def mainWindow():
+        return None
+
+
+class _Ui:
+    @staticmethod
+    def displayMessage(text, *args, **kwargs):
+        print(f"[hou.ui] {text}")
+        return kwargs.get("default_choice", 0)
+
+    @staticmethod
+    def setStatusMessage(text, *args, **kwargs):
+        pass
+
+    @staticmethod
+    def readInput(*args, **kwargs):
+        return (1, "")
+
+
+class _HipFile:
+    _name = "untitled.hip"
+    _callbacks = []
+
+    @classmethod
+    def name(cls):
+        return cls._name
+
+    @classmethod
+    def setName(cls, name):
+        cls._name = name
+
+    @staticmethod
+    def hasUnsavedChanges():
+        return False
+
+    @classmethod
+    def addEventCallback(cls, callback):
+        cls._callbacks.append(callback)
+
+    @classmethod
+    def removeEventCallback(cls, callback):
+        if callback in cls._callbacks:
+            cls._callbacks.remove(callback)
+
+
+class _Undos:
+    @staticmethod
+    @contextlib.contextmanager
+    def group(label):
+        yield
+
+
+class _UpdateMode:
+    current = "updateMode.AutoUpdate"
+
+    @classmethod
+    def setting(cls):
+        return cls.current
+
+    @classmethod
+    def set(cls, mode):
+        cls.current = mode
+
+
+def _build_module():
+    hou = types.ModuleType("hou")
+    hou.__dict__.update({
+        "qt": _Qt(),
+        "ui": _Ui(),
+        "hipFile": _HipFile,
+        "severityType": _Enum("severityType"),
+        "hipFileEventType": _Enum("hipFileEventType"),
+        "undos": _Undos(),
+        "updateMode": _Enum("updateMode"),
+        "updateModeSetting": _UpdateMode.setting,
+        "setUpdateMode": _UpdateMode.set,
+        "OperationFailed": type("OperationFailed", (Exception,), {}),
+        "getenv": lambda name, default=None: os.environ.get(name, default),
+        "homeHoudiniDirectory": lambda: os.path.expanduser("~"),
+    })
+    return hou
+
+
+def install():
+    """Put python/ on sys.path and register a stub `hou` if Houdini is not available"""
+    python_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if python_dir not in sys.path:
+        sys.path.insert(0, python_dir)
+    try:
+        import hou  # noqa: F401
+        return False
+    except ImportError:
+        pass
+    sys.modules["hou"] = _build_module()
+    return True
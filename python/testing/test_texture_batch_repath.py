@@ -0,0 +1,101 @@
+"""
+Test cho Texture Batch Repath: đọc/ghi CPIO (.hip ASCII) và thay thế chuỗi trong entry .parm
+Chạy được ngoài Houdini: python python/testing/test_texture_batch_repath.py (hoặc pytest)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "mono_tools", "texture_search_replace"))
+import texture_batch_repath as repath  # noqa: E402
+from texture_matcher import TextureMatcher  # noqa: E402
+
+PARM_ENTRY = (
+    b'{\nversion 0.8\n'
+    b'file\t[ 0\tlocks=0 ]\t(\t"D:/Old/tex_\\$F4\\n.exr"\t)\n'
+    b'name\t[ 0\tlocks=0 ]\t(\t"D:/Old/keep"\t)\n'
+    b'tex0\t[ 8\tlocks=0\tautoscope=0000 ]\t(\t"D:/Old/say \\"hi\\"\\\\a.exr"\t"x"\t)\n'
+    b'}\n'
+)
+
+
+def _entry(name, content, mode=b"100644"):
+    header = (repath.CPIO_MAGIC + b"000000" * 2 + mode + b"000000" * 4 + b"%011o" % 1234567890
+              + b"%06o" % (len(name) + 1))
+    return header + b"%011o" % len(content) + name + b"\0" + content
+
+
+def _hip(entries):
+    return b"".join(_entry(name, content) for name, content in entries) + \
+        _entry(repath.CPIO_TRAILER.encode(), b"")
+
+
+def test_cpio_round_trip_is_byte_identical():
+    data = _hip([(b".start", b"fplayback -i on\n"), (b"obj/geo1.parm", PARM_ENTRY),
+                 (b"obj/geo1.userdata", b"\x00\xff binary \x01")])
+    entries, tail = repath.read_cpio_entries(data)
+    assert [e[1] for e in entries] == [".start", "obj/geo1.parm", "obj/geo1.userdata", repath.CPIO_TRAILER]
+    assert repath.write_cpio_entries(entries, tail) == data
+
+
+def test_cpio_rejects_non_hip():
+    try:
+        repath.read_cpio_entries(b"not a hip file")
+    except repath.HipFormatError:
+        return
+    raise AssertionError("HipFormatError expected")
+
+
+def test_repath_only_texture_parms_and_keeps_escapes():
+    matcher = TextureMatcher("D:/Old/", "E:/New/")
+    content, changes = repath.repath_parm_entry(PARM_ENTRY, matcher)
+    assert b'file\t[ 0\tlocks=0 ]\t(\t"E:/New/tex_\\$F4\\n.exr"\t)\n' in content
+    assert b'name\t[ 0\tlocks=0 ]\t(\t"D:/Old/keep"\t)\n' in content
+    assert b'(\t"E:/New/say \\"hi\\"\\\\a.exr"\t"x"\t)' in content
+    assert content == PARM_ENTRY.replace(b'"D:/Old/tex', b'"E:/New/tex').replace(b'"D:/Old/say', b'"E:/New/say')
+    assert [(parm, new) for parm, old, new in changes] == [
+        ("file", "E:/New/tex_\\$F4\\n.exr"), ("tex0", 'E:/New/say "hi"\\a.exr')]
+
+
+def test_repath_escapes_replacement_text():
+    matcher = TextureMatcher("D:/Old/", 'E:\\New "v2"/')
+    content, changes = repath.repath_parm_entry(b'file\t[ 0\tlocks=0 ]\t(\t"D:/Old/a.exr"\t)\n', matcher)
+    assert content == b'file\t[ 0\tlocks=0 ]\t(\t"E:\\\\New \\"v2\\"/a.exr"\t)\n'
+    assert changes == [("file", "D:/Old/a.exr", 'E:\\New "v2"/a.exr')]
+
+
+def test_repath_hip_file_dry_run_and_apply():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "shot.hip")
+        original = _hip([(b"obj/geo1.parm", PARM_ENTRY)])
+        with open(path, "wb") as f:
+            f.write(original)
+
+        report = repath.repath_hip_file(path, "D:/Old/", "E:/New/")
+        assert report["status"] == "dry-run" and len(report["changes"]) == 2
+        assert report["changes"][0]["node"] == "/obj/geo1" and report["changes"][0]["parm"] == "file"
+        with open(path, "rb") as f:
+            assert f.read() == original
+
+        report = repath.repath_hip_file(path, "D:/Old/", "E:/New/", apply=True, backup=False)
+        assert report["status"] == "changed"
+        with open(path, "rb") as f:
+            entries, _ = repath.read_cpio_entries(f.read())
+        assert b'"E:/New/tex_\\$F4\\n.exr"' in entries[0][2]
+        assert b'"D:/Old/keep"' in entries[0][2]
+
+
+if __name__ == "__main__":
+    ok = True
+    for test in (test_cpio_round_trip_is_byte_identical, test_cpio_rejects_non_hip,
+                 test_repath_only_texture_parms_and_keeps_escapes, test_repath_escapes_replacement_text,
+                 test_repath_hip_file_dry_run_and_apply):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            ok = False
+            print(f"❌ {test.__name__}\n{e}")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,59 @@
+"""
+Test UDIM grouping của texture_ingest (Material Loader) trên folder tạm
+Chạy được ngoài Houdini (stub hou): python python/testing/test_texture_ingest.py (hoặc pytest)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import stub_hou  # noqa: E402
+
+stub_hou.install()
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from mono_tools.material_loader import texture_ingest  # noqa: E402
+
+
+def _scan(names):
+    with tempfile.TemporaryDirectory() as folder:
+        for name in names:
+            open(os.path.join(folder, name), "wb").close()
+        texture_set = texture_ingest.scan_texture_folder(folder)
+        return {prefix: {ttype: os.path.basename(path) for ttype, path in types.items()}
+                for prefix, types in texture_set.texture_paths(True).items()}, texture_set
+
+
+def test_udim_tiles_grouped():
+    paths, texture_set = _scan(["Head_BaseColor.1001.exr", "Head_BaseColor.1002.exr",
+                                "Head_BaseColor.1011.exr", "Rock_1001_Normal.exr"])
+    assert paths == {"Head": {"BaseColor": "Head_BaseColor.<UDIM>.exr"},
+                     "Rock": {"Normal": "Rock_<UDIM>_Normal.exr"}}
+    assert texture_set.materials["Head"]["BaseColor"].tile_range() == "1001-1002, 1011"
+
+
+def test_resolution_numbers_are_not_udim():
+    paths, texture_set = _scan(["Rock_2048_Normal.png", "Rock_2048_BaseColor.png",
+                                "Wood_0001_Albedo.jpg", "Wood_0001_Roughness.jpg"])
+    assert paths == {"Rock_2048": {"Normal": "Rock_2048_Normal.png", "BaseColor": "Rock_2048_BaseColor.png"},
+                     "Wood_0001": {"Albedo": "Wood_0001_Albedo.jpg", "Roughness": "Wood_0001_Roughness.jpg"}}
+    assert not any(tmap.tiles for types in texture_set.materials.values() for tmap in types.values())
+
+
+def test_udim_tag_path():
+    assert texture_ingest.udim_tag_path(os.path.join("tex", "a_Normal.1001.exr")) == \
+        os.path.join("tex", "a_Normal.<UDIM>.exr")
+    assert texture_ingest.udim_tag_path("Rock_2048_Normal.png") == "Rock_2048_Normal.png"
+
+
+if __name__ == "__main__":
+    ok = True
+    for test in (test_udim_tiles_grouped, test_resolution_numbers_are_not_udim, test_udim_tag_path):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            ok = False
+            print(f"❌ {test.__name__}\n{e}")
+    sys.exit(0 if ok else 1)
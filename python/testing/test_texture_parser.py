@@ -0,0 +1,103 @@
+"""
+Corpus test cho texture file name parser của Material Loader
+Chạy được ngoài Houdini: python python/testing/test_texture_parser.py (hoặc pytest)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "mono_tools", "material_loader"))
+import texture_parser  # noqa: E402
+
+# file name -> (prefix, ttype, canonical, udim, ext, colorspace)
+CORPUS = {
+    # Substance Painter: $mesh_$textureSet_$channel(.$udim)
+    "Robot_Body_BaseColor.1001.png": ("Robot_Body", "BaseColor", "basecolor", "1001", ".png", None),
+    "Robot_Body_Roughness.1002.png": ("Robot_Body", "Roughness", "roughness", "1002", ".png", None),
+    "Robot_Body_Metallic.1001.png": ("Robot_Body", "Metallic", "metalness", "1001", ".png", None),
+    "Robot_Body_Normal.1001.png": ("Robot_Body", "Normal", "normal", "1001", ".png", None),
+    "Crate_Normal_OpenGL.png": ("Crate", "Normal", "normal", None, ".png", None),
+    "Crate_Normal_DirectX.png": ("Crate", "Normal", "normal", None, ".png", None),
+    "Crate_Height.png": ("Crate", "Height", "height", None, ".png", None),
+    "Crate_Emissive.png": ("Crate", "Emissive", "emission", None, ".png", None),
+    "Crate_Opacity.png": ("Crate", "Opacity", "opacity", None, ".png", None),
+    "Crate_Mixed_AO.png": ("Crate", "Mixed_AO", "occlusion", None, ".png", None),
+    "Metal_Plate_Roughness.exr": ("Metal_Plate", "Roughness", "roughness", None, ".exr", None),
+    # Mari: $ENTITY_$CHANNEL(_colorspace).$UDIM
+    "Head_Diffuse.1001.exr": ("Head", "Diffuse", "basecolor", "1001", ".exr", None),
+    "Head_Diffuse_ACEScg.1012.exr": ("Head", "Diffuse", "basecolor", "1012", ".exr", "acescg"),
+    "Head_Specular_Raw.1001.exr": ("Head", "Specular", "specular", "1001", ".exr", "raw"),
+    "Head_Bump_1003.tif": ("Head", "Bump", "bump", "1003", ".tif", None),
+    "Head_Displacement.<UDIM>.exr": ("Head", "Displacement", "height", "<UDIM>", ".exr", None),
+    "diffuse.1001.tif": ("", "diffuse", "basecolor", "1001", ".tif", None),
+    "wood_BaseColor - ACEScg.1001.exr": ("wood", "BaseColor", "basecolor", "1001", ".exr", "ACEScg"),
+    "wood_Roughness - Utility - Raw.1001.exr": ("wood", "Roughness", "roughness", "1001", ".exr",
+                                                "Utility - Raw"),
+    # Quixel Megascans: $id_$res_$type(_LODn)
+    "vfendgyiw_4K_Albedo.jpg": ("vfendgyiw", "Albedo", "basecolor", None, ".jpg", None),
+    "vfendgyiw_4K_Roughness.jpg": ("vfendgyiw", "Roughness", "roughness", None, ".jpg", None),
+    "vfendgyiw_4K_Normal_LOD0.jpg": ("vfendgyiw", "Normal", "normal", None, ".jpg", None),
+    "vfendgyiw_4K_Displacement.exr": ("vfendgyiw", "Displacement", "height", None, ".exr", None),
+    "vfendgyiw_4K_AO.jpg": ("vfendgyiw", "AO", "occlusion", None, ".jpg", None),
+    "vfendgyiw_4K_Cavity.jpg": ("vfendgyiw", "Cavity", "cavity", None, ".jpg", None),
+    "vfendgyiw_4K_Gloss.jpg": ("vfendgyiw", "Gloss", "glossiness", None, ".jpg", None),
+    "vfendgyiw_4K_Translucency.jpg": ("vfendgyiw", "Translucency", "translucency", None, ".jpg", None),
+    "Aset_wood_raw_M_tkboffsfa_2K_Bump.jpg": ("Aset_wood_raw_M_tkboffsfa", "Bump", "bump", None, ".jpg", None),
+    # Short suffixes, UDIM before the type
+    "T_Rock_N.png": ("T_Rock", "N", "normal", None, ".png", None),
+    "Rock_1001_BaseColor.exr": ("Rock", "BaseColor", "basecolor", "1001", ".exr", None),
+    # 4-digit groups outside 1001-1999 are resolutions / versions, not UDIM tiles
+    "Rock_2048_Albedo.jpg": ("Rock_2048", "Albedo", "basecolor", None, ".jpg", None),
+    "Wood_0001_Roughness.jpg": ("Wood_0001", "Roughness", "roughness", None, ".jpg", None),
+}
+
+NOT_TEXTURES = ("readme.txt", "notes.png", "Asset_preview_v2.jpg", "thumbnail.jpg", "BaseColor")
+
+
+def _fields(info):
+    return (info.prefix, info.ttype, info.canonical, info.udim, info.ext, info.colorspace)
+
+
+def test_corpus():
+    failures = []
+    for name, expected in CORPUS.items():
+        info = texture_parser.parse_texture_filename(name)
+        got = _fields(info) if info else None
+        if got != expected:
+            failures.append(f"{name}: {got} != {expected}")
+    assert not failures, "\n".join(failures)
+
+
+def test_rejects_non_textures():
+    for name in NOT_TEXTURES:
+        assert texture_parser.parse_texture_filename(name) is None, name
+
+
+def test_path_and_cache():
+    info = texture_parser.parse_texture_filename(os.path.join("D:", "tex", "Crate_Height.png"))
+    assert info.prefix == "Crate" and info.filename == "Crate_Height.png"
+    assert texture_parser.parse_texture_filename("Crate_Height.png") is \
+        texture_parser.parse_texture_filename("Crate_Height.png")
+    assert texture_parser.canonical_type("ALBEDO") == "basecolor"
+    assert texture_parser.canonical_type("unknown") is None
+
+
+def test_token_table_is_frozen():
+    try:
+        texture_parser.TOKEN_TYPES["new"] = "basecolor"
+    except TypeError:
+        return
+    raise AssertionError("TOKEN_TYPES should be read-only")
+
+
+if __name__ == "__main__":
+    ok = True
+    for test in (test_corpus, test_rejects_non_textures, test_path_and_cache, test_token_table_is_frozen):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            ok = False
+            print(f"❌ {test.__name__}\n{e}")
+    sys.exit(0 if ok else 1)